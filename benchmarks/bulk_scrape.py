@@ -0,0 +1,106 @@
+""" bulk_scrape.py                                        yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Throughput of the bulk birth date scraper (athletics.bulk) against a local
+    HTTP stand-in for Wikipedia.
+
+  Progression pages (with a redirect in front of each, as Wikipedia does for
+    many titles) and athlete biography pages are generated in memory and
+    served from a threaded local server that adds a fixed delay per request
+    to mimic network latency. The scraper is then run at several pool sizes;
+    pages per second should grow with the pool size, not with page count.
+
+      python3 benchmarks/bulk_scrape.py [--athletes 400] [--latency 0.05]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from athletics.bulk import GENDERS, PROGRESSION_EVENTS, progression_url, scrape_dobs
+
+
+def make_site(n_athletes, events):
+    """path -> (status, headers, body) for a small fake Wikipedia."""
+    site = {}
+    per_page = max(1, n_athletes // (len(events) * len(GENDERS)))
+    k = 0
+    for event in events:
+        for gender in GENDERS:
+            rows = []
+            for _ in range(per_page):
+                name = f"Athlete {k}"
+                rows.append(f'<tr><td>{10 + k % 50}.{k % 100:02d}</td>'
+                            f'<td><a href="/wiki/Athlete_{k}">{name}</a><sup>[{k % 7}]</sup></td>'
+                            f'<td>ABC</td><td>{1 + k % 28} May {1950 + k % 70}</td></tr>')
+                site[f"/wiki/Athlete_{k}"] = (200, {}, (
+                    f'<html><body><h1>{name}</h1><table class="infobox"><tr><th>Born</th>'
+                    f'<td><span style="display:none">(<span class="bday">{1940 + k % 60}-'
+                    f'{1 + k % 12:02d}-{1 + k % 28:02d}</span>)</span></td></tr></table>'
+                    f'</body></html>').encode())
+                k += 1
+            path = urlsplit(progression_url(event, gender, "")).path
+            site[unquote(path)] = (301, {"Location": path + "_(page)"}, b"")
+            site[unquote(path) + "_(page)"] = (200, {}, (
+                '<html><body><table class="wikitable"><tr><th>Mark</th><th>Athlete</th>'
+                '<th>Nationality</th><th>Date</th></tr>' + "".join(rows) + '</table></body></html>'
+            ).encode())
+    return site
+
+
+def serve(site, latency):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        wbufsize = -1  # send headers and body in one write
+
+        def do_GET(self):
+            time.sleep(latency)
+            status, headers, body = site.get(unquote(self.path), (404, {}, b"not found"))
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--athletes", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every response")
+    parser.add_argument("--pools", type=int, nargs="*", default=[1, 4, 16, 32])
+    args = parser.parse_args(argv)
+
+    events = list(PROGRESSION_EVENTS)[:5]
+    site = make_site(args.athletes, events)
+    server = serve(site, args.latency)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    print(f"{len(site)} paths, {args.latency * 1000:.0f} ms latency")
+    for size in args.pools:
+        report = {}
+        start = time.perf_counter()
+        dobs = scrape_dobs(events, base, report, concurrency=size, per_host=size, rate=None)
+        seconds = time.perf_counter() - start
+        found = sum(len(df) for df in dobs.values())
+        assert not report, report
+        print(f"pool {size:>3}: {found} birth dates in {seconds:6.2f}s ({len(site) / seconds:7.1f} requests/s)")
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
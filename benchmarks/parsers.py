@@ -0,0 +1,113 @@
+""" parsers.py                                            yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Benchmark of the two world records table parsers:
+    - BeautifulSoup + get_table() (html.parser tree, two walks per table)
+    - parse_records() (single-pass event-driven parser)
+
+  By default a large Wikipedia-style page is generated from the records CSVs,
+    with rowspans, flagged rows, references and inline styles, and repeated
+    until it has the requested number of rows per table. A saved page (e.g.
+    a file from data/snapshots/) can be given instead. Both parsers must
+    return identical frames before any timing is reported.
+
+      python3 benchmarks/parsers.py [--rows 20000] [--page saved.html]
+"""
+
+import argparse
+import html
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import pandas as pd
+
+from athletics.paths import DAT
+from athletics.scrape import get_table, parse_records
+
+COLUMNS = ["Performance", "Wind", "Avg. speed mph (kmph)", "Pts", "Athlete",
+           "Nationality", "Date", "Meeting", "Location", "Country"]
+
+
+def records_table(df, n_rows):
+    """A wikitable holding df's rows, repeated up to n_rows body rows."""
+    out = ['<table class="wikitable sortable">',
+           '<tr><th colspan="12">World records</th></tr>',
+           '<tr>' + "".join(f"<th>{html.escape(c)}</th>" for c in
+                            COLUMNS[:2] + ["Ref"] + COLUMNS[2:]) + '<th>Notes</th></tr>']
+    rows = df.fillna("").astype(str).values.tolist()
+    i = 0
+    while i < n_rows:
+        event, *values = rows[i % len(rows)]
+        # Every tenth event is shared by two rows (rowspan), every 25th row is flagged
+        span = 2 if i % 10 == 0 else 1
+        for j in range(span):
+            style = ' style="background:pink"' if (i + j) % 25 == 24 else ""
+            cells = [f'<td>{html.escape(v)}</td>' for v in values]
+            cells.insert(2, '<td><sup class="reference"><a href="#c">[1]</a></sup></td>')
+            cells[5] = (f'<td><span class="flagicon"><img src="x.png"/></span> '
+                        f'<a href="/wiki/A">{html.escape(values[4])}</a><!-- c --></td>')
+            first = f'<th rowspan="{span}">{html.escape(event)}&nbsp;</th>' if j == 0 else ""
+            out.append(f'<tr{style}>{first}' + "".join(cells) + '<td></td></tr>')
+        i += span
+    out.append("</table>")
+    return "\n".join(out)
+
+
+def make_page(n_rows, men=None, women=None):
+    """A Wikipedia-style page with the two records tables, n_rows rows each,
+    from the men's and women's frames (the real record lists by default)."""
+    if men is None:
+        men = pd.read_csv(DAT + "world_records_men.csv", dtype=str)
+    if women is None:
+        women = pd.read_csv(DAT + "world_records_women.csv", dtype=str)
+    return ("<html><head><style>.x{}</style></head><body>\n"
+            + records_table(men, n_rows) + "\n<p>Women</p>\n"
+            + records_table(women, n_rows)
+            + '\n<table class="wikitable"><tr><th>Other</th></tr></table>'
+            + "\n</body></html>")
+
+
+def bs4_parse(page):
+    from bs4 import BeautifulSoup
+    tables = BeautifulSoup(page, "html.parser").find_all("table", class_="wikitable")
+    return get_table(tables[0]), get_table(tables[1])
+
+
+def best_of(func, arg, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(arg)
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--rows", type=int, default=20000, help="body rows per generated table")
+    parser.add_argument("--page", help="benchmark a saved HTML page instead")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.page:
+        with open(args.page, "rb") as f:
+            page = f.read().decode("utf-8")
+    else:
+        page = make_page(args.rows)
+
+    t_bs4, (men_a, women_a) = best_of(bs4_parse, page, args.repeat)
+    t_stream, (men_b, women_b) = best_of(parse_records, page, args.repeat)
+    pd.testing.assert_frame_equal(men_a, men_b)
+    pd.testing.assert_frame_equal(women_a, women_b)
+
+    print(f"page: {len(page) / 1e6:.1f} MB, {len(men_a) + len(women_a)} rows kept")
+    print(f"{'BeautifulSoup + get_table':<28} {t_bs4:8.3f}s")
+    print(f"{'parse_records (streaming)':<28} {t_stream:8.3f}s  ({t_bs4 / t_stream:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
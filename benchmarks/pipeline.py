@@ -0,0 +1,184 @@
+""" pipeline.py                                           yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Scaling benchmark of every pipeline step on synthetic data (synthetic.py).
+
+  For each size the records, birth dates, performance log and page are
+    generated, then each step is run once under an athletics Profiler:
+    parsing the page (BeautifulSoup + get_table, and parse_records),
+    classify_event, time_to_seconds (normalize_performance, which it wraps),
+    the continent merge, the age join, the whole of prepare_records, the
+    grouped statistics, the record store, building a FrameIndex and a few
+    lookups on it, the streaming log ingest, the season top lists and
+    personal bests, the OLS fits (batched and statsmodels) and every
+    figure. The report gives rows, seconds, rows per second and peak
+    traced memory per step and size, and the growth exponent between sizes
+    (1.0 is linear), so a step that has gone quadratic stands out. --json saves the numbers for later runs.
+
+  Peak memory comes from tracemalloc, which slows everything down; pass
+    --no-memory for clean timings.
+
+      python3 benchmarks/pipeline.py [--sizes 1000 10000 100000] [--json out.json]
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from synthetic import generate
+
+
+def steps(n, seed, max_page, tmp):
+    """(name, function, rows) for every step at size n; each function runs one step."""
+    from athletics.ages import age_stats, plot_ages_box, plot_ages_dist
+    from athletics.athletes import AthleteIndex
+    from athletics.countries import CountryIndex
+    from athletics.events import EventTaxonomy
+    from athletics.gender_gap import gender_gap, plot_gender_gap
+    from athletics.ingest import read_log
+    from athletics.keely import diamond_league, fit_trend, plot_keely_all, plot_keely_DL
+    from athletics.longest import plot_longest_records
+    from athletics.olympics import olympic_year_counts, plot_olympic_years
+    from athletics.performance import normalize_performance
+    from athletics.prepare import prepare_records
+    from athletics.progression import RecordStore
+    from athletics.query import FrameIndex
+    from athletics.schema import concat
+    from athletics.scrape import parse_records
+    from athletics.toplists import SeasonLists
+    from athletics.trends import fit_trends
+    from parsers import bs4_parse, make_page
+
+    raw = generate(n, seed)
+    men, women = raw["world_records_men"], raw["world_records_women"]
+    for name, df in raw.items():
+        df.to_csv(os.path.join(tmp, name + ".csv"), index=False)
+    html = make_page(min(n, max_page), men, women)
+    countries = CountryIndex.from_csv()
+    athletes = AthleteIndex.from_csv(dobs=os.path.join(tmp, "dobs.csv"))
+    state = {}
+
+    def prepare():
+        state["men"] = prepare_records(men, countries, athletes, "Male")
+        state["women"] = prepare_records(women, countries, athletes, "Female")
+
+    def ingest():
+        state["log"] = concat(read_log(os.path.join(tmp, "keely_data.csv")))
+        state["dl"] = diamond_league(state["log"])
+
+    def store():
+        state["store"] = RecordStore.from_frames(state["men"], state["women"])
+        state["at"] = state["store"].at("2025-04-09", "Male"), state["store"].at("2025-04-09", "Female")
+
+    def lookups():
+        index = FrameIndex(state["men"])
+        state["found"] = [index.rows(Event="800 m"), index.rows(Group=["Sprints", "Hurdles"]),
+                          index.rows(Continent_Name="Europe", date_from="1980", date_to="1989-12-31")]
+
+    def ols():
+        state["model"] = fit_trend(state["dl"])
+
+    def figure(name):
+        return os.path.join(tmp, name + ".png")
+
+    rows = len(men) + len(women)
+    page_rows = 2 * min(n, max_page)
+    return [
+        ("get_table (bs4)", lambda: bs4_parse(html), page_rows),
+        ("parse_records", lambda: parse_records(html), page_rows),
+        ("classify_event", lambda: EventTaxonomy.from_csv().classify(men["Event"]), n),
+        ("time_to_seconds", lambda: normalize_performance(men["Performance"]), n),
+        ("continent merge", lambda: countries.resolve(men["Nationality"]), n),
+        ("athlete index", lambda: AthleteIndex.from_csv(dobs=os.path.join(tmp, "dobs.csv")), len(raw["dobs"]) * 2),
+        ("age join", lambda: athletes.dob(men["Athlete"], "Male"), n),
+        ("prepare_records", prepare, rows),
+        ("grouped stats", lambda: age_stats(state["men"], state["women"]), rows),
+        ("record store", store, rows),
+        ("indexed lookups", lookups, n),
+        ("log ingest", ingest, n),
+        ("season lists", lambda: SeasonLists.from_chunks([state["log"]]), n),
+        ("OLS batched", lambda: fit_trends(state["log"], record=113.28), n),
+        ("OLS statsmodels", ols, n),
+        ("olympic_years", lambda: plot_olympic_years(olympic_year_counts(*state["at"]), figure("olympic_years")), rows),
+        ("gender_gap", lambda: plot_gender_gap(gender_gap(state["men"], state["women"]), figure("gender_gap")), rows),
+        ("ages_dist", lambda: plot_ages_dist(state["men"], state["women"], figure("ages_dist")), rows),
+        ("ages_box", lambda: plot_ages_box(state["men"], state["women"], figure("ages_box")), rows),
+        ("longest_records", lambda: plot_longest_records(state["store"], figure("longest_records"), "2025-04-09"), rows),
+        ("keely_all", lambda: plot_keely_all(state["log"], figure("keely_all")), n),
+        ("keely_DL", lambda: plot_keely_DL(state["dl"], state["model"], figure("keely_DL")), n),
+    ]
+
+
+def run(sizes, seed=0, max_page=20000, memory=True, skip=()):
+    from athletics.instrument import Profiler
+
+    # One small unrecorded pass first, so imports (statsmodels, scipy, seaborn)
+    # and first-use caches are not charged to the smallest size
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, func, rows in steps(100, seed, 100, tmp):
+            if name not in skip:
+                func()
+
+    results = []
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, func, rows in steps(n, seed, max_page, tmp):
+                if name in skip:
+                    continue
+                profiler = Profiler(memory=memory).start()
+                try:
+                    with profiler.span(name) as step:
+                        func()
+                        step.rows = rows
+                finally:
+                    profiler.stop()
+                event = profiler.events[-1]
+                results.append({"step": name, "size": n, "rows": rows, "seconds": event["wall"],
+                                "cpu": event["cpu"], "peak_mb": event["peak"] / 1e6 if memory else None})
+                print(f"  {n:>9} {name:<18} {event['wall']:8.3f}s", file=sys.stderr)
+    return results
+
+
+def report(results):
+    lines = [f"{'step':<18} {'size':>9} {'rows':>9} {'seconds':>9} {'rows/s':>11} {'peak MB':>8} {'growth':>6}"]
+    previous = {}
+    for r in results:
+        growth = ""
+        before = previous.get(r["step"])
+        if before and before["rows"] != r["rows"] and before["seconds"] > 0.01:
+            growth = f"{math.log(r['seconds'] / before['seconds']) / math.log(r['rows'] / before['rows']):.2f}"
+        peak = "" if r["peak_mb"] is None else f"{r['peak_mb']:.1f}"
+        lines.append(f"{r['step']:<18} {r['size']:>9} {r['rows']:>9} {r['seconds']:>9.3f} "
+                     f"{r['rows'] / max(r['seconds'], 1e-9):>11.0f} {peak:>8} {growth:>6}")
+        previous[r["step"]] = r
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="*", default=[1000, 10000, 100000],
+                        help="rows per generated file (up to 10^7)")
+    parser.add_argument("--max-page", type=int, default=20000, help="cap on rows per page table")
+    parser.add_argument("--skip", nargs="*", default=[], help="steps to leave out, e.g. keely_all")
+    parser.add_argument("--no-memory", action="store_true", help="do not trace allocations")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the results here")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.seed, args.max_page, not args.no_memory, set(args.skip))
+    order = list(dict.fromkeys(r["step"] for r in results))
+    results.sort(key=lambda r: (order.index(r["step"]), r["size"]))
+    print(report(results))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
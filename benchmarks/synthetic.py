@@ -0,0 +1,165 @@
+""" synthetic.py                                          yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Synthetic inputs at any size, shaped like the real ones in data/.
+
+  Each generated row starts from a real one (so events, mark formats,
+    meetings and venues look like the record lists and keely_data.csv) and
+    then gets a worse mark, an athlete from a pool of about one per twenty
+    rows (some names accented, so the name index has work to do), a
+    nationality from the real IOC and historic codes plus a few that do not
+    resolve, and a date 17-40 years after the athlete's birth date. Birth
+    dates are written in the wide dobs.csv layout, performance logs in the
+    keely_data.csv layout with an Athlete column, and the records tables
+    as a Wikipedia-style page (see parsers.py).
+
+  Everything is generated with NumPy from one seed, so 10^7 rows take
+    seconds to minutes rather than hours.
+
+      python3 benchmarks/synthetic.py --rows 100000 --out /tmp/synthetic
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import numpy as np
+import pandas as pd
+
+from athletics.paths import DAT
+from athletics.performance import normalize_performance
+
+FIRST = ["Usain", "Jarmila", "Marita", "Florence", "Keely", "Jakob", "Faith", "Armand", "Yulimar",
+         "Beatrice", "Sydney", "Karsten", "Ruth", "Ewa", "Zoë", "José", "Łukasz", "Søren", "Anaïs",
+         "Hicham", "Kenenisa", "Letesenbet", "Mutaz", "Ryan", "Femke", "Noah", "Shelly-Ann", "Iñaki"]
+LAST = ["Bolt", "Kratochvílová", "Koch", "Griffith", "Hodgkinson", "Ingebrigtsen", "Kipyegon",
+        "Duplantis", "Rojas", "Chebet", "McLaughlin", "Warholm", "Beitia", "Kłosowska", "Núñez",
+        "O'Brien", "Gebrselassie", "Gidey", "Crouser", "Bol", "Lyles", "Fraser-Pryce", "Müller",
+        "Dvořák", "Ødegaard", "Çelik", "Łęcki", "El Guerrouj"]
+UNKNOWN_CODES = ["XXA", "ZZZ"]  # codes no alias or ISO row knows
+EVENTS = ["800", "1500", "400", "600", "1000"]
+
+
+def _real_records():
+    return pd.concat([pd.read_csv(DAT + f"world_records_{gender}.csv", dtype=str)
+                      for gender in ("men", "women")], ignore_index=True)
+
+
+def _format_marks(values, units):
+    """Mark strings in the record lists' styles: ss.ss, m:ss.ss, h:mm:ss.ss, x.xx m, n pts."""
+    values = np.asarray(values, dtype=float)
+    hours, rest = np.divmod(values, 3600)
+    minutes, seconds = np.divmod(rest, 60)
+    sec = pd.Series(np.round(seconds, 2)).map("{:05.2f}".format)
+    mins = pd.Series(minutes.astype(np.int64)).astype(str)
+    times = np.where(hours > 0, pd.Series(hours.astype(np.int64)).astype(str) + ":" + mins.str.zfill(2) + ":" + sec,
+                     np.where(minutes > 0, mins + ":" + sec, pd.Series(np.round(values, 2)).map("{:.2f}".format)))
+    metres = pd.Series(np.round(values, 2)).map("{:.2f} m".format)
+    points = pd.Series(np.round(values)).astype(np.int64).astype(str) + " pts"
+    units = np.asarray(units, dtype=object)
+    return np.where(units == "s", times, np.where(units == "m", metres, points))
+
+
+def athletes(n):
+    """n distinct athlete names (accented first/last names, numbered past the combinations)."""
+    first = np.array(FIRST, dtype=object)[np.arange(n) % len(FIRST)]
+    last = np.array(LAST, dtype=object)[(np.arange(n) // len(FIRST)) % len(LAST)]
+    names = pd.Series(first + " " + last)
+    repeat = np.arange(n) // (len(FIRST) * len(LAST))
+    names = names.where(repeat == 0, names + " " + pd.Series(repeat).astype(str))
+    return names.to_numpy(dtype=object)
+
+
+def birth_dates(n, rng):
+    return pd.Timestamp("1900-01-01") + pd.to_timedelta(rng.integers(0, 38000, n), unit="D")
+
+
+def records(n, rng, pool=None):
+    """(records frame in the world_records_*.csv layout, athlete names, birth dates)."""
+    real = _real_records()
+    rows = real.iloc[rng.integers(0, len(real), n)].reset_index(drop=True)
+
+    # Worse marks than the records: slower times, shorter distances, fewer points
+    marks = normalize_performance(rows["Performance"])
+    known = marks["unit"].notna().to_numpy()
+    worse = rng.uniform(1.0, 1.15, n)
+    value = np.where(marks["unit"] == "s", marks["value"] * worse, marks["value"] / worse)
+    rows["Performance"] = np.where(known, _format_marks(value, marks["unit"].astype(object)), rows["Performance"])
+    rows["Pts"] = np.where(rows["Pts"].notna(), (rows["Pts"].astype(float) / worse).round().astype("Int64").astype(str),
+                           None)
+
+    pool = max(n // 20, 50) if pool is None else pool
+    names, dobs = athletes(pool), birth_dates(pool, rng)
+    who = rng.integers(0, pool, n)
+    rows["Athlete"] = names[who]
+    rows["Date"] = (dobs[who] + pd.to_timedelta(rng.uniform(17 * 365.25, 40 * 365.25, n), unit="D")).strftime("%d %b %Y")
+
+    codes = np.append(pd.read_csv(DAT + "country_aliases.csv")["code"].to_numpy(dtype=object),
+                      real["Nationality"].dropna().unique())
+    nationality = codes[rng.integers(0, len(codes), n)]
+    rows["Nationality"] = np.where(rng.random(n) < 0.01, rng.choice(UNKNOWN_CODES, n), nationality)
+    return rows, names, dobs
+
+
+def dobs_wide(men, women):
+    """Birth dates in the dobs.csv layout from (names, dates) per gender."""
+    def column(values, n):
+        return pd.Series(values).reindex(range(n))
+    n = max(len(men[0]), len(women[0]))
+    return pd.DataFrame({
+        "Female Athlete": column(women[0], n), "Female DOB": column(women[1].strftime("%d/%m/%Y"), n),
+        "Male Athlete": column(men[0], n), "Male DOB": column(men[1].strftime("%d/%m/%Y"), n),
+        "": column([], n),
+    })
+
+
+def performance_log(n, rng, athletes_n=None):
+    """A keely_data.csv style log of n marks by many athletes (about a fifth indoors)
+    over 2015-2024."""
+    real = pd.read_csv(DAT + "keely_data.csv", dtype=str)
+    rows = real.iloc[rng.integers(0, len(real), n)].reset_index(drop=True)
+    athletes_n = max(n // 50, 10) if athletes_n is None else athletes_n
+    rows.insert(0, "Athlete", athletes(athletes_n)[rng.integers(0, athletes_n, n)])
+    rows["Event"] = np.array(EVENTS)[rng.integers(0, len(EVENTS), n)]
+    rows["Indoor"] = np.where(rng.random(n) < 0.2, "i", None)
+    # Times improving by about 1.4 s a year, so the trend reaches 1:53.28 in the 2020s
+    days = rng.integers(0, 10 * 365, n)
+    rows["Perf"] = _format_marks(126.0 - 1.4 * days / 365.25 + rng.normal(0, 2.5, n), np.full(n, "s"))
+    rows["Date"] = (pd.Timestamp("2015-01-01") + pd.to_timedelta(days, unit="D")).strftime("%d-%b-%y")
+    return rows
+
+
+def generate(n, seed=0):
+    """Raw synthetic inputs with n rows each: men, women, dobs and log frames."""
+    rng = np.random.default_rng(seed)
+    men, men_names, men_dobs = records(n, rng)
+    women, women_names, women_dobs = records(n, rng)
+    return {"world_records_men": men, "world_records_women": women,
+            "dobs": dobs_wide((men_names, men_dobs), (women_names, women_dobs)),
+            "keely_data": performance_log(n, rng)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--rows", type=int, default=100000, help="rows per generated file")
+    parser.add_argument("--out", required=True, help="directory to write the CSVs and page to")
+    parser.add_argument("--page-rows", type=int, default=None, help="rows per page table (default: --rows)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+    frames = generate(args.rows, args.seed)
+    for name, df in frames.items():
+        df.to_csv(os.path.join(args.out, name + ".csv"), index=False)
+    from parsers import make_page
+    html = make_page(args.page_rows or args.rows, frames["world_records_men"], frames["world_records_women"])
+    with open(os.path.join(args.out, "records.html"), "w", encoding="utf-8") as f:
+        f.write(html)
+    print(f"{args.rows} rows per file, {len(html) / 1e6:.1f} MB page, in {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+""" athletics                                             yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  This package examines athletics world records for both men and women.
+    It does so by using the data from Wikipedia:
+
+  Wikipedia contributors. "List of world records in athletics." Wikipedia.
+    https://en.wikipedia.org/wiki/List_of_world_records_in_athletics.
+
+  The data is firstly webscraped from the above link, and saved as a csv.
+    This is then read in directly with pd.read_csv().
+    Full details related to the replication of this file can be found in the
+    README code in the top level of this directory.
+
+  Importing the package has no side effects and does not import pandas or
+    matplotlib; the names below are resolved from their modules on first use.
+    Run the pipeline with `python3 -m athletics [STAGE ...]`.
+
+  Contact: mailto:rje215@exeter.ac.uk
+"""
+
+import importlib
+
+_EXPORTS = {
+    "get_table": "scrape",
+    "fetch_tables": "scrape",
+    "parse_records": "scrape",
+    "scrape_dobs": "bulk",
+    "classify_event": "events",
+    "EventTaxonomy": "events",
+    "time_to_seconds": "performance",
+    "normalize_performance": "performance",
+    "parse_speed": "performance",
+    "CountryIndex": "countries",
+    "AthleteIndex": "athletes",
+    "load_records": "prepare",
+    "load_keely": "prepare",
+    "load_progression": "prepare",
+    "read_log": "ingest",
+    "LogStore": "ingest",
+    "MeetingTiers": "meetings",
+    "FrameIndex": "query",
+    "SeasonLists": "toplists",
+    "ScoringTable": "scoring",
+    "RecordStore": "progression",
+    "memory_report": "schema",
+    "grouped_stats": "stats",
+    "QuantileSketch": "stats",
+    "join_calendar": "championships",
+    "olympic_effect": "olympics",
+    "gender_gaps": "gender_gap",
+    "gap_history": "gender_gap",
+    "fit_trends": "trends",
+    "STAGES": "stages",
+    "run": "stages",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module("." + _EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
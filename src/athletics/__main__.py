@@ -0,0 +1,78 @@
+""" __main__.py                                           yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Command line entry point:
+
+      python3 -m athletics                      # every stage, as before
+      python3 -m athletics gender_gap keely_DL  # only the named stages
+      python3 -m athletics --force              # ignore the build cache
+      python3 -m athletics -j 4                 # build up to 4 stages at once
+      python3 -m athletics --list
+      python3 -m athletics --memory             # memory used by the prepared frames
+      python3 -m athletics --profile trace.json # time/memory per stage and step
+      python3 -m athletics --watch              # stay up, rebuild as data/ changes
+
+  Stages whose data and code are unchanged since their last build are
+    skipped; a hit/miss report with the time saved is printed at the end.
+"""
+
+import argparse
+import sys
+
+from .cache import BuildCache
+from .instrument import Profiler
+from .stages import STAGES, format_report, run
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="athletics",
+                                     description="Build the athletics world records figures and tables.")
+    parser.add_argument("stages", nargs="*", metavar="STAGE",
+                        help="stages to run (default: all). One of: " + ", ".join(STAGES))
+    parser.add_argument("--list", action="store_true", help="list the stages and their outputs")
+    parser.add_argument("--memory", action="store_true", help="print a memory report of the prepared frames")
+    parser.add_argument("-f", "--force", action="store_true", help="rebuild stages even if their inputs are unchanged")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="stages to build at once, in separate processes")
+    parser.add_argument("--profile", metavar="TRACE", help="profile the stages that run; write a Chrome trace JSON here")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and rebuild affected stages whenever data/ or index.md changes")
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not print the hit/miss report")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for stage in STAGES.values():
+            print(f"{stage.name:<16} {', '.join(stage.outputs)}")
+        return 0
+
+    if args.memory:
+        from .prepare import load_keely, load_records
+        from .schema import memory_report
+        df_men, df_women = load_records()
+        print(memory_report({"df_men": df_men, "df_women": df_women, "keely": load_keely()}).to_string())
+        return 0
+
+    if args.watch:
+        from .watch import watch
+        unknown = [name for name in args.stages if name not in STAGES]
+        if unknown:
+            parser.error(f"Unknown stage(s): {', '.join(unknown)}")
+        return watch(args.stages or None)
+
+    profiler = Profiler().start() if args.profile else None
+    try:
+        report = run(args.stages, cache=BuildCache(), force=args.force, jobs=args.jobs, profiler=profiler)
+    except KeyError as e:
+        parser.error(e.args[0])
+    finally:
+        if profiler is not None:
+            profiler.stop()
+    if not args.quiet:
+        print(format_report(report))
+    if profiler is not None:
+        profiler.write(args.profile)
+        print(profiler.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
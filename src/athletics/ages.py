@@ -0,0 +1,88 @@
+""" ages.py                                               yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Sections (5)-(7): ages of record breakers.
+    (5) Figure 3: distribution of ages, men vs women.
+    (6) Table 1: average ages of record breakers for event groups.
+    (7) Figure 4: boxplot of the above.
+"""
+
+import pandas as pd
+
+from .paths import FIG, TAB
+from .plotting import figure
+from .stats import OVERALL, grouped_stats
+
+
+def plot_ages_dist(df_men, df_women, path=FIG + "ages_dist.png"):
+    # Plot histograms (saved to path at the end of the block):
+    with figure(path, figsize=(12, 7)) as fig:
+        ax = fig.add_subplot()
+        ax.hist(df_men['Age'], bins=15, alpha=0.5, color='blue', label='Men')
+        ax.hist(df_women['Age'], bins=15, alpha=0.5, color='pink', label='Women')
+
+        # Format:
+        ax.set_xlabel("Age at Time of Record (Years)")
+        ax.set_ylabel("Frequency")
+        ax.set_title("Distribution of Ages at Record Breaking for Men and Women")
+        ax.legend()
+        ax.grid(axis='y', linestyle='--', alpha=0.7)
+
+
+def age_stats(df_men, df_women):
+    """Age statistics for every gender x event group and each gender overall."""
+    return grouped_stats({'Men': df_men, 'Women': df_women})
+
+
+def age_table(stats):
+    """Mean/median/min/max age per event group, plus an Overall column."""
+    # Statistics for each group, then the total statistics:
+    groups = stats.drop(index=['Relay', 'Exclude', 'Other', OVERALL], errors='ignore')
+    table = pd.concat([groups, stats.loc[[OVERALL]]])
+    return table[['Mean', 'Median', 'Min', 'Max']].astype(float).round(2).transpose()  # Transpose for easier formatting later
+
+
+def avg_ages(df_men, df_women, stats=None):
+    # Table:
+    stats = age_stats(df_men, df_women) if stats is None else stats
+    return pd.concat([age_table(stats.loc['Men']), age_table(stats.loc['Women'])], keys=['Men', 'Women'])
+
+
+def write_avg_ages(df_avg_ages, path=TAB + "avg_ages.html"):
+    # Save:
+    with open(path, "w") as f:
+        f.write(df_avg_ages.to_html(index=False, border=1))
+
+
+def plot_ages_box(df_men, df_women, path=FIG + "ages_box.png", stats=None):
+    import seaborn as sns
+    from matplotlib.patches import Patch
+
+    # Boxes drawn from the same statistics as the table (quartiles, whiskers, fliers):
+    stats = age_stats(df_men, df_women) if stats is None else stats
+    genders = ['Men', 'Women']
+    # Boxes in order of first appearance, not every category of the dtype:
+    order = [group for group in pd.unique(pd.concat([df_men['Group'], df_women['Group']]).astype(str))
+             if group not in ('Other', 'Relay')]
+    colours = sns.color_palette('Set2', len(genders))
+    width = 0.8 / len(genders)
+
+    # Plot (saved to path at the end of the block):
+    with figure(path, figsize=(12, 6)) as fig:
+        ax = fig.add_subplot()
+        for i, (gender, colour) in enumerate(zip(genders, colours)):
+            offset = (i - (len(genders) - 1) / 2) * width
+            boxes = [(x + offset, stats.loc[(gender, group)]) for x, group in enumerate(order)
+                     if (gender, group) in stats.index]
+            ax.bxp([{'med': box['Median'], 'q1': box['Q1'], 'q3': box['Q3'], 'whislo': box['Whislo'],
+                     'whishi': box['Whishi'], 'fliers': box['Fliers']} for _, box in boxes],
+                   positions=[x for x, _ in boxes], widths=width, patch_artist=True, manage_ticks=False,
+                   boxprops={'facecolor': colour}, medianprops={'color': 'black'})
+        ax.set_xticks(range(len(order)), order)
+        ax.set_xlim(-.5, len(order) - .5)
+        ax.legend(handles=[Patch(facecolor=colour, label=gender) for gender, colour in zip(genders, colours)],
+                  title='Gender')
+        ax.set_title('Age Distribution by Event Group and Gender')
+        ax.set_xlabel('Group')
+        ax.set_ylabel('Age')
+        fig.tight_layout()
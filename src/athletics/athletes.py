@@ -0,0 +1,140 @@
+""" athletes.py                                           yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Athlete identity index: athlete name -> birth date.
+
+  Names are matched on a key rather than the exact string: accents are
+    folded (Kratochvílová -> kratochvilova), case, hyphens, apostrophes and
+    spacing are ignored, and the result is hashed to a 64-bit integer. Names
+    that differ by more than that (transliterations, nicknames, married
+    names) are listed in data/athlete_aliases.csv as alias,athlete pairs.
+
+  AthleteIndex.dob() factorises a column of names, keys each distinct name
+    once and looks the keys up in a pandas Index, so the join costs
+    O(unique names) however many result rows there are; unmatched() lists
+    the names it could not find.
+
+      python3 -m athletics.athletes         # unmatched athletes in the records
+"""
+
+import sys
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .paths import DAT
+
+DOBS = DAT + "dobs.csv"
+ALIASES = DAT + "athlete_aliases.csv"
+GENDERS = ("Male", "Female")
+
+# Letters NFKD leaves alone:
+FOLD = str.maketrans({"ł": "l", "Ł": "L", "ø": "o", "Ø": "O", "đ": "d", "Đ": "D",
+                      "ß": "ss", "æ": "ae", "Æ": "AE", "œ": "oe", "Œ": "OE", "ı": "i"})
+
+
+def normalize_names(names):
+    """Lower-case ASCII form of names with punctuation and extra spaces removed."""
+    names = pd.Series(names, dtype=object)
+    return (names.str.translate(FOLD)
+            .str.normalize("NFKD").str.encode("ascii", "ignore").str.decode("ascii")
+            .str.lower()
+            .str.replace(r"['’.]", "", regex=True)
+            .str.replace(r"[^a-z0-9]+", " ", regex=True)
+            .str.strip())
+
+
+def name_keys(names, gender):
+    """uint64 key for each of a gender's names (missing names get key 0)."""
+    normalized = normalize_names(names)
+    keys = pd.util.hash_array((gender + "|" + normalized.fillna("")).to_numpy(dtype=object))
+    return np.where(normalized.isna().to_numpy(), 0, keys)
+
+
+class AthleteIndex:
+    """(gender, name key) -> athlete and birth date lookup table."""
+
+    def __init__(self, athletes, aliases=None):
+        athletes = pd.DataFrame(athletes, columns=["Gender", "Athlete", "DOB"]).dropna(subset=["Athlete"])
+        athletes = athletes.reset_index(drop=True)
+        keys = np.zeros(len(athletes), dtype=np.uint64)
+        for gender, rows in athletes.groupby("Gender", sort=False).indices.items():
+            keys[rows] = name_keys(athletes["Athlete"].iloc[rows], gender)
+        self.athletes = athletes
+        self.keys = pd.Series(np.arange(len(athletes)), index=keys)
+
+        if aliases is not None:
+            aliases = pd.DataFrame(aliases, columns=["alias", "athlete"])
+            extra = []
+            for gender in athletes["Gender"].unique():
+                known = self._lookup(name_keys(aliases["athlete"], gender))
+                found = known >= 0
+                extra.append(pd.Series(known[found], index=name_keys(aliases["alias"][found], gender)))
+            self.keys = pd.concat([self.keys] + extra)
+
+        duplicated = self.keys.index.duplicated(keep=False)
+        clashes = self.keys[duplicated].groupby(level=0).nunique()
+        if (clashes > 1).any():
+            names = self.athletes.loc[self.keys[duplicated].unique(), "Athlete"]
+            raise ValueError(f"Athlete names share a key: {', '.join(names)}")
+        self.keys = self.keys[~self.keys.index.duplicated()]
+
+    @classmethod
+    def from_csv(cls, dobs=DOBS, aliases=ALIASES):
+        """Index of the wide "<Gender> Athlete" / "<Gender> DOB" layout of dobs.csv."""
+        wide = pd.read_csv(dobs)
+        athletes = pd.concat([pd.DataFrame({"Gender": gender, "Athlete": wide[f"{gender} Athlete"],
+                                            "DOB": pd.to_datetime(wide[f"{gender} DOB"], format="%d/%m/%Y")})
+                              for gender in GENDERS], ignore_index=True)
+        return cls(athletes, pd.read_csv(aliases))
+
+    def _lookup(self, keys):
+        found = self.keys.index.get_indexer(keys)
+        return np.where(found < 0, -1, self.keys.to_numpy()[found] if len(self.keys) else -1)
+
+    def lookup(self, names, gender):
+        """Row of self.athletes for each name (-1 where there is none)."""
+        names = pd.Series(names)
+        codes, uniques = pd.factorize(names, use_na_sentinel=True)
+        rows = self._lookup(name_keys(uniques, gender))
+        return np.where(codes < 0, -1, rows[codes] if len(uniques) else -1)
+
+    def dob(self, names, gender):
+        """Birth date for each of a gender's names, on names' index (NaT if unknown)."""
+        names = pd.Series(names)
+        rows = self.lookup(names, gender)
+        dobs = self.athletes["DOB"].to_numpy(dtype="datetime64[ns]")
+        values = np.where(rows < 0, np.datetime64("NaT"), dobs[rows] if len(dobs) else np.datetime64("NaT"))
+        return pd.Series(values.astype("datetime64[ns]"), index=names.index, name=f"{gender} DOB")
+
+    def unmatched(self, names, gender):
+        """Row counts of the (non-missing) names that have no birth date."""
+        names = pd.Series(names).dropna()
+        counts = names.value_counts(sort=False)
+        counts = counts[(counts > 0) & (self.lookup(counts.index, gender) < 0)]
+        return counts.sort_index().rename("Rows").rename_axis("Athlete")
+
+
+@lru_cache(maxsize=None)
+def default_athletes():
+    return AthleteIndex.from_csv()
+
+
+def main(argv=None):
+    """Print the record holders (relays aside) with no birth date."""
+    from .prepare import load_records
+
+    missing = 0
+    for gender, df in zip(GENDERS, load_records()):
+        relay = df["Event"].astype(str).str.contains("relay")
+        unmatched = default_athletes().unmatched(df.loc[~relay, "Athlete"], gender)
+        missing += len(unmatched)
+        print(f"{gender}: {len(unmatched)} athlete(s) with no birth date")
+        if len(unmatched):
+            print(unmatched.to_string())
+    return 1 if missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
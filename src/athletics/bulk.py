@@ -0,0 +1,416 @@
+""" bulk.py                                               yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Concurrent bulk scraper for world record progression pages and athlete
+    biography pages, used to build birth dates instead of hand-maintaining
+    data/dobs.csv.
+
+  For each event and gender the "<Men's/Women's> <event> world record
+    progression" page is fetched, every athlete linked from its tables is
+    collected, and their biography pages are fetched to read the birth date
+    from the infobox (<span class="bday">). The result has the same
+    "<Gender> Athlete" / "<Gender> DOB" (dd/mm/yyyy) columns as dobs.csv.
+
+  Fetching runs on asyncio. Each host gets a small pool of keep-alive
+    http.client connections, worked from a thread pool, and a rate limiter, so
+    throughput grows with the pool size rather than with the number of pages
+    while each host is still only hit at the allowed rate. Only the standard
+    library is used; point base at a local server (python3 -m http.server in
+    a folder of saved pages) to run without touching Wikipedia.
+
+  With --progression the records in the progression tables are written
+    instead, as data/world_record_progression.csv (the history RecordStore
+    adds to the current lists).
+
+      python3 -m athletics.bulk --out data/dobs_scraped.csv
+      python3 -m athletics.bulk --progression --out data/world_record_progression.csv
+"""
+
+import argparse
+import asyncio
+import http.client
+import re
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import quote, urljoin, urlsplit
+
+import pandas as pd
+
+WIKI = "https://en.wikipedia.org"
+USER_AGENT = "athletics-blog-scraper/1.0 (mailto:rje215@exeter.ac.uk)"
+
+# Title fragments of the progression pages, e.g. "Men's 100 metres world record progression"
+PROGRESSION_EVENTS = {
+    "100 m": "100 metres",
+    "200 m": "200 metres",
+    "400 m": "400 metres",
+    "800 m": "800 metres",
+    "1500 m": "1500 metres",
+    "Mile": "mile",
+    "5000 m": "5000 metres",
+    "10,000 m": "10,000 metres",
+    "Marathon": "marathon",
+    "110 m hurdles": "110 metres hurdles",
+    "100 m hurdles": "100 metres hurdles",
+    "400 m hurdles": "400 metres hurdles",
+    "3000 m steeplechase": "3000 metres steeplechase",
+    "High jump": "high jump",
+    "Pole vault": "pole vault",
+    "Long jump": "long jump",
+    "Triple jump": "triple jump",
+    "Shot put": "shot put",
+    "Discus throw": "discus throw",
+    "Hammer throw": "hammer throw",
+    "Javelin throw": "javelin throw",
+}
+GENDERS = {"Male": "Men's", "Female": "Women's"}
+
+# Header cells (lower-cased, by prefix) of the progression tables' columns:
+MARK_HEADERS = ("time", "mark", "distance", "height", "result")
+PLACE_HEADERS = ("venue", "location", "place", "event/place", "meet")
+PROGRESSION_COLUMNS = ["Gender", "Event", "Performance", "Athlete", "Nationality", "Date", "Location"]
+
+BDAY_RE = re.compile(rb'class="bday"[^>]*>\s*(\d{4}-\d{2}-\d{2})\s*<')
+REF_RE = re.compile(r"\[[^\]]*\]")
+
+#------------------------------------------------------------------------------
+#--- Fetching
+#------------------------------------------------------------------------------
+
+class HostPool:
+    """Keep-alive connections and a request rate limit for one host."""
+
+    def __init__(self, scheme, host, size, rate, timeout):
+        self.scheme = scheme
+        self.host = host
+        self.timeout = timeout
+        self.interval = 1 / rate if rate else 0
+        self.slots = asyncio.Semaphore(size)
+        self.idle = []
+        self.next_start = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait_turn(self):
+        # Space request starts at least `interval` apart on this host
+        async with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_start)
+            self.next_start = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    def _connect(self):
+        cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return cls(self.host, timeout=self.timeout)
+
+    def _request(self, conn, path):
+        conn.request("GET", path, headers={"User-Agent": USER_AGENT, "Connection": "keep-alive"})
+        response = conn.getresponse()
+        return response.status, response.getheader("Location"), response.read()
+
+    def request(self, path):
+        # Runs in a worker thread; retries once on a fresh connection (the kept-alive
+        # one may have gone stale)
+        try:
+            conn = self.idle.pop()
+        except IndexError:
+            conn = self._connect()
+        try:
+            result = self._request(conn, path)
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            conn = self._connect()
+            try:
+                result = self._request(conn, path)
+            except BaseException:
+                # Timeouts and resets included: a failed socket never goes back in the pool
+                conn.close()
+                raise
+        self.idle.append(conn)
+        return result
+
+    def close(self):
+        while self.idle:
+            self.idle.pop().close()
+
+
+class Fetcher:
+    """Fetch many URLs concurrently with per-host connection pools.
+
+    concurrency caps requests in flight overall, per_host caps connections to
+    any one host and rate caps requests started per second on any one host.
+    """
+
+    def __init__(self, concurrency=16, per_host=4, rate=10.0, timeout=30, max_redirects=5):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.rate = rate
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self.pools = {}
+        self.slots = None
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="fetch")
+
+    def _pool(self, scheme, host):
+        if (scheme, host) not in self.pools:
+            self.pools[scheme, host] = HostPool(scheme, host, self.per_host, self.rate, self.timeout)
+        return self.pools[scheme, host]
+
+    async def fetch(self, url):
+        """Return the body of url, following redirects; raise on HTTP errors."""
+        if self.slots is None:
+            self.slots = asyncio.Semaphore(self.concurrency)
+        async with self.slots:
+            for _ in range(self.max_redirects + 1):
+                parts = urlsplit(url)
+                pool = self._pool(parts.scheme, parts.netloc)
+                path = (parts.path or "/") + ("?" + parts.query if parts.query else "")
+                async with pool.slots:
+                    await pool.wait_turn()
+                    status, location, body = await asyncio.get_running_loop().run_in_executor(
+                        self.executor, pool.request, path)
+                if status in (301, 302, 303, 307, 308) and location:
+                    url = urljoin(url, location)
+                    continue
+                if status != 200:
+                    raise OSError(f"HTTP {status} for {url}")
+                return body
+            raise OSError(f"Too many redirects for {url}")
+
+    async def fetch_all(self, urls):
+        """Map each url to its body, or to the exception raised fetching it."""
+        urls = list(dict.fromkeys(urls))
+        bodies = await asyncio.gather(*(self.fetch(url) for url in urls), return_exceptions=True)
+        return dict(zip(urls, bodies))
+
+    def close(self):
+        self.executor.shutdown()
+        for pool in self.pools.values():
+            pool.close()
+
+#------------------------------------------------------------------------------
+#--- Page extraction
+#------------------------------------------------------------------------------
+
+def progression_url(event, gender, base=WIKI):
+    title = f"{GENDERS[gender]} {PROGRESSION_EVENTS.get(event, event)} world record progression"
+    return f"{base}/wiki/" + quote(title.replace(" ", "_"))
+
+
+def expand_rowspans(trs):
+    """Body rows of a table with each rowspan cell repeated in the rows it spans.
+
+    trs are read_wikitables() rows; returns a list of cell lists, each as
+    wide as the widest row.
+    """
+    rows = []
+    spanning = {}  # column -> [cell, rows still to fill]
+    for _, cells in trs:
+        cells, row, col = list(cells), [], 0
+        while cells or col in spanning:
+            if col in spanning:
+                cell = spanning[col][0]
+                spanning[col][1] -= 1
+                if not spanning[col][1]:
+                    del spanning[col]
+            else:
+                cell = cells.pop(0)
+                span = int(cell[2]) if cell[2] and str(cell[2]).isdigit() else 1
+                if span > 1:
+                    spanning[col] = [cell, span - 1]
+            row.append(cell)
+            col += 1
+        rows.append(row)
+    return rows
+
+
+def progression_athletes(html, base=WIKI):
+    """(name, biography url) for each athlete linked in a progression page."""
+    from .scrape import read_wikitables
+
+    athletes = {}
+    for trs in read_wikitables(html).tables:
+        if not trs:
+            continue
+        headers = ["".join(text).lower() for _, text, _, _ in trs[0][1]]
+        if "athlete" not in headers:
+            continue
+        col = headers.index("athlete")
+        for cells in expand_rowspans(trs[1:]):
+            if len(cells) <= col:
+                continue
+            _, text, _, href = cells[col]
+            name = REF_RE.sub("", "".join(text)).strip()
+            if name and href and href.startswith("/wiki/") and name not in athletes:
+                athletes[name] = urljoin(base, href)
+    return list(athletes.items())
+
+
+def _column(headers, names):
+    return next((i for i, header in enumerate(headers) if header.startswith(names)), None)
+
+
+def _text(cell):
+    return REF_RE.sub("", "".join(cell[1])).strip()
+
+
+def progression_records(html, event, gender):
+    """Records listed in a progression page's tables, one row each, with the
+    PROGRESSION_COLUMNS of data/world_record_progression.csv.
+
+    Marks keep the text of the page's time or mark column (metres get an
+    " m" so they parse like the record lists) and dates are written
+    dd Mon yyyy. Rows without a readable mark or date are left out.
+    """
+    from .scrape import read_wikitables
+
+    rows = []
+    for trs in read_wikitables(html).tables:
+        if not trs:
+            continue
+        headers = [_text(cell).lower() for cell in trs[0][1]]
+        cols = [_column(headers, names) for names in
+                (MARK_HEADERS, ("athlete", "name"), ("nationality", "nation"), ("date",), PLACE_HEADERS)]
+        if None in cols[:2] or cols[3] is None:
+            continue
+        timed = headers[cols[0]].startswith("time")
+        for cells in expand_rowspans(trs[1:]):
+            text = [_text(cells[col]) if col is not None and col < len(cells) else "" for col in cols]
+            mark = text[0].split(" ")[0].rstrip("+*AaWw")
+            date = pd.to_datetime(text[3], errors="coerce")
+            if not mark or pd.isna(date):
+                continue
+            rows.append((gender, event, mark if timed else mark.rstrip("m") + " m",
+                         text[1], text[2], date.strftime("%d %b %Y"), text[4]))
+    return pd.DataFrame(rows, columns=PROGRESSION_COLUMNS).drop_duplicates(ignore_index=True)
+
+
+def birth_date(html):
+    """Birth date from a biography infobox as dd/mm/yyyy, or None."""
+    match = BDAY_RE.search(html)
+    if match is None:
+        return None
+    return datetime.strptime(match.group(1).decode(), "%Y-%m-%d").strftime("%d/%m/%Y")
+
+#------------------------------------------------------------------------------
+#--- Birth dates
+#------------------------------------------------------------------------------
+
+async def progression_pages(events, base, fetcher, report):
+    """Fetch the progression page of every event and gender at once; returns
+    {(event, gender): body}, leaving out (and reporting) pages that failed."""
+    pages = {(event, gender): progression_url(event, gender, base)
+             for event in events for gender in GENDERS}
+    bodies = await fetcher.fetch_all(pages.values())
+    found = {}
+    for key, url in pages.items():
+        if isinstance(bodies[url], Exception):
+            report[url] = str(bodies[url])
+        else:
+            found[key] = bodies[url]
+    return found
+
+
+async def scrape_dobs_async(events, base=WIKI, fetcher=None, report=None):
+    """Birth dates of every athlete on the events' progression pages.
+
+    Returns {gender: DataFrame["<gender> Athlete", "<gender> DOB"]}. Pages
+    that could not be fetched, or have no birth date, are listed in report
+    (a dict of url -> reason) if one is given.
+    """
+    fetcher = Fetcher() if fetcher is None else fetcher
+    report = {} if report is None else report
+    try:
+        # Progression pages for every event and gender at once:
+        pages = await progression_pages(events, base, fetcher, report)
+        athletes = defaultdict(dict)
+        for (event, gender), body in pages.items():
+            for name, bio in progression_athletes(body, base):
+                athletes[gender].setdefault(name, bio)
+
+        # Then every biography page at once:
+        bios = await fetcher.fetch_all(bio for names in athletes.values() for bio in names.values())
+    finally:
+        fetcher.close()
+
+    dobs = {}
+    for gender in GENDERS:
+        rows = []
+        for name, bio in athletes[gender].items():
+            body = bios[bio]
+            dob = None if isinstance(body, Exception) else birth_date(body)
+            if dob is None:
+                report[bio] = str(body) if isinstance(body, Exception) else "no birth date"
+                continue
+            rows.append((name, dob))
+        dobs[gender] = pd.DataFrame(rows, columns=[f"{gender} Athlete", f"{gender} DOB"])
+    return dobs
+
+
+def scrape_dobs(events=tuple(PROGRESSION_EVENTS), base=WIKI, report=None, **fetcher_options):
+    """Blocking wrapper around scrape_dobs_async()."""
+    return asyncio.run(scrape_dobs_async(events, base, Fetcher(**fetcher_options), report))
+
+
+async def scrape_progression_async(events, base=WIKI, fetcher=None, report=None):
+    """Every record on the events' progression pages, in the layout of
+    data/world_record_progression.csv (see progression_records())."""
+    fetcher = Fetcher() if fetcher is None else fetcher
+    report = {} if report is None else report
+    try:
+        pages = await progression_pages(events, base, fetcher, report)
+    finally:
+        fetcher.close()
+    frames = [progression_records(body, event, gender) for (event, gender), body in pages.items()]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=PROGRESSION_COLUMNS)
+
+
+def scrape_progression(events=tuple(PROGRESSION_EVENTS), base=WIKI, report=None, **fetcher_options):
+    """Blocking wrapper around scrape_progression_async()."""
+    return asyncio.run(scrape_progression_async(events, base, Fetcher(**fetcher_options), report))
+
+
+def dobs_wide(dobs):
+    """Lay per-gender birth dates out side by side like data/dobs.csv."""
+    return pd.concat([dobs["Female"], dobs["Male"]], axis=1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="athletics.bulk",
+                                     description="Scrape athletes' birth dates from record progression pages.")
+    parser.add_argument("--out", default="-", help="CSV to write (default: stdout)")
+    parser.add_argument("--progression", action="store_true",
+                        help="write the records in the progression tables instead of birth dates")
+    parser.add_argument("--base", default=WIKI, help="site to scrape, e.g. a local stand-in server")
+    parser.add_argument("--events", nargs="*", default=list(PROGRESSION_EVENTS))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--per-host", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=10.0, help="requests per second per host")
+    args = parser.parse_args(argv)
+
+    report = {}
+    start = time.perf_counter()
+    if args.progression:
+        records = scrape_progression(args.events, args.base, report, concurrency=args.concurrency,
+                                     per_host=args.per_host, rate=args.rate)
+        records.to_csv(sys.stdout if args.out == "-" else args.out, index=False)
+        print(f"{len(records)} records in {time.perf_counter() - start:.2f}s, "
+              f"{len(report)} page(s) skipped", file=sys.stderr)
+        return 0
+    dobs = scrape_dobs(args.events, args.base, report, concurrency=args.concurrency,
+                       per_host=args.per_host, rate=args.rate)
+    seconds = time.perf_counter() - start
+    dobs_wide(dobs).to_csv(sys.stdout if args.out == "-" else args.out, index=False)
+
+    found = sum(len(df) for df in dobs.values())
+    print(f"{found} birth dates in {seconds:.2f}s, {len(report)} page(s) skipped", file=sys.stderr)
+    for url, reason in report.items():
+        print(f"  {url}: {reason}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+""" cache.py                                              yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Content-addressed build cache for the pipeline stages.
+
+  Every stage declares the data files and source modules it reads. The
+    stage's key is a SHA-256 over the stage name and the bytes of each of
+    those files, so a stage is only re-run when something it depends on has
+    actually changed (editing keely_data.csv no longer re-renders the world
+    record figures). Settings a stage depends on (its `params`, such as the
+    reference date) are hashed in too. Keys and the time each stage last took are kept in a
+    small JSON manifest next to the results, which is also what the "time
+    saved" in the run report is worked out from.
+"""
+
+import hashlib
+import json
+import os
+
+from .paths import RES
+
+MANIFEST = RES + ".stage_cache.json"
+
+
+def file_digest(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class BuildCache:
+    """Per-stage input hashes and timings, persisted as JSON."""
+
+    def __init__(self, path=MANIFEST):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                # A corrupt manifest just means everything is rebuilt once
+                self.entries = {}
+        self._digests = {}
+
+    def _file_digest(self, path):
+        # Several stages share inputs, so only hash each file once per run
+        if path not in self._digests:
+            self._digests[path] = file_digest(path)
+        return self._digests[path]
+
+    def forget(self, paths):
+        """Drop remembered digests, e.g. after a stage rewrote its outputs."""
+        for path in paths:
+            self._digests.pop(path, None)
+
+    def key(self, stage):
+        h = hashlib.sha256(stage.name.encode())
+        for path in stage.inputs:
+            h.update(path.encode())
+            h.update(self._file_digest(path).encode())
+        for param in stage.params:
+            h.update(param.encode())
+        return h.hexdigest()
+
+    def is_fresh(self, stage):
+        """True if the stage's inputs are unchanged and its outputs exist."""
+        if stage.inputs is None:
+            return False
+        entry = self.entries.get(stage.name)
+        if entry is None or entry["key"] != self.key(stage):
+            return False
+        return all(os.path.exists(path) for path in stage.outputs)
+
+    def record(self, stage, seconds):
+        if stage.inputs is None:
+            return
+        self.entries[stage.name] = {"key": self.key(stage), "seconds": round(seconds, 4)}
+
+    def seconds(self, stage):
+        return self.entries.get(stage.name, {}).get("seconds", 0.0)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
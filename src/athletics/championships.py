@@ -0,0 +1,52 @@
+""" championships.py                                      yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Championship calendar: which years had an Olympics or World Championships.
+
+  The years come from data/championships.csv (year,championship,host) rather
+    than a rule such as Year % 4 == 0, so the exceptions are just rows: Tokyo
+    2020 was held in 2021, Eugene's 2021 Worlds in 2022, and there were no
+    Games in 1916, 1940 or 1944. join_calendar() adds a True/False column per
+    championship to a frame with a Year column in one reindex.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .paths import DAT
+
+CALENDAR = DAT + "championships.csv"
+
+
+@lru_cache(maxsize=None)
+def load_calendar(path=CALENDAR):
+    """Year x championship table of flags, one row per year with a championship."""
+    df = pd.read_csv(path)
+    return (pd.crosstab(df["year"], df["championship"]).astype(bool)
+            .rename_axis(index="Year", columns=None))
+
+
+def join_calendar(df, calendar=None):
+    """Flags of the championships held in each row's Year, on df's index."""
+    calendar = load_calendar() if calendar is None else calendar
+    flags = calendar.reindex(df["Year"].to_numpy(), fill_value=False)
+    return flags.set_axis(df.index)
+
+
+def cycle_lengths(years, championship="Olympics", calendar=None):
+    """Length in years of the championship cycle each year falls in.
+
+    A cycle runs from the year after one edition up to and including the
+    next, so 2017-2021 is five years and 2022-2024 three; years past the
+    calendar get four.
+    """
+    calendar = load_calendar() if calendar is None else calendar
+    held = calendar.index[calendar[championship]].to_numpy()
+    years = np.asarray(years)
+    upcoming = np.searchsorted(held, years, side="left")
+    known = upcoming < len(held)
+    upcoming = np.minimum(upcoming, len(held) - 1)
+    previous = np.where(upcoming > 0, held[np.maximum(upcoming - 1, 0)], held[upcoming] - 4)
+    return np.where(known, held[upcoming] - previous, 4)
@@ -0,0 +1,113 @@
+""" countries.py                                          yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Country resolution: nationality code -> ISO code, country and continent.
+
+  Results use IOC codes (DEN, GER, RSA, ...) and historic teams (URS, GDR,
+    TCH, ...), while the continent list is keyed on ISO 3166 alpha-3 codes.
+    data/country_aliases.csv bridges the two. Each alias row is
+      code,iso,country,continent
+    where an empty country/continent is taken from the iso row, and a row
+    with no iso at all describes a team that no longer exists. Aliases win
+    over ISO codes (IOC ANT is Antigua, ISO ANT the Netherlands Antilles).
+    Countries the list puts on two continents keep the first one, unless an
+    alias says otherwise.
+
+  CountryIndex.resolve() factorises a column of codes and looks each distinct
+    code up once in a pandas Index, so resolving millions of rows costs
+    O(unique codes); unresolved() lists the codes it could not place.
+
+      python3 -m athletics.countries        # unresolved codes in the records
+"""
+
+import sys
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .paths import DAT
+from .schema import compact
+
+COUNTRIES = DAT + "country-and-continent-codes-list-csv.csv"
+ALIASES = DAT + "country_aliases.csv"
+RECORDS = (DAT + "world_records_men.csv", DAT + "world_records_women.csv")
+COLUMNS = ["Three_Letter_Country_Code", "Country_Name", "Continent_Name"]
+
+
+class CountryIndex:
+    """Country code -> (ISO code, country name, continent) lookup table."""
+
+    def __init__(self, countries, aliases=None):
+        # country-and-continent-codes-list-csv from https://gist.github.com/stevewithington/20a69c0b6d2ff846ea5d35e5fc47f26c#file-country-and-continent-codes-list-csv-csv
+        iso = (countries.dropna(subset=["Three_Letter_Country_Code"])
+               .drop_duplicates("Three_Letter_Country_Code")
+               .set_index("Three_Letter_Country_Code", drop=False)[COLUMNS])
+        table = iso
+        if aliases is not None:
+            aliases = pd.DataFrame(aliases, columns=["code", "iso", "country", "continent"]).reset_index(drop=True)
+            unknown = set(aliases["iso"].dropna()) - set(iso.index)
+            if unknown:
+                raise ValueError(f"Country alias(es) to unknown ISO code(s): {', '.join(sorted(unknown))}")
+            target = iso.reindex(aliases["iso"]).reset_index(drop=True)
+            rows = pd.DataFrame({"Three_Letter_Country_Code": aliases["iso"],
+                                 "Country_Name": aliases["country"].fillna(target["Country_Name"]),
+                                 "Continent_Name": aliases["continent"].fillna(target["Continent_Name"])})
+            rows.index = aliases["code"].to_numpy()
+            incomplete = rows.index[rows[["Country_Name", "Continent_Name"]].isna().any(axis=1)]
+            if len(incomplete):
+                raise ValueError(f"Country alias(es) with no country or continent: {', '.join(incomplete)}")
+            rows = rows[~rows.index.duplicated()]  # earlier aliases win
+            table = pd.concat([rows, iso[~iso.index.isin(rows.index)]])
+        self.table = compact(table.rename_axis(None))
+
+    @classmethod
+    def from_csv(cls, countries=COUNTRIES, aliases=ALIASES):
+        return cls(pd.read_csv(countries), pd.read_csv(aliases, dtype=str))
+
+    def resolve(self, codes):
+        """ISO code, country and continent columns for codes, on codes' index.
+
+        Each column is categorical; codes that can't be resolved are missing.
+        """
+        codes = pd.Series(codes)
+        positions, uniques = pd.factorize(codes, use_na_sentinel=True)
+        rows = self.table.index.get_indexer(uniques)
+        rows = np.where(positions < 0, -1, rows[positions] if len(uniques) else -1)
+
+        resolved = {}
+        for col in COLUMNS:
+            values = self.table[col]
+            col_codes = values.cat.codes.to_numpy()
+            resolved[col] = pd.Categorical.from_codes(
+                np.where(rows < 0, -1, col_codes[rows] if len(col_codes) else -1),
+                categories=values.cat.categories)
+        return pd.DataFrame(resolved, index=codes.index)
+
+    def unresolved(self, codes):
+        """Row counts of the (non-missing) codes that resolve() can't place."""
+        codes = pd.Series(codes).dropna()
+        counts = codes.value_counts(sort=False)
+        counts = counts[(counts > 0) & ~counts.index.isin(self.table.index)]
+        return counts.sort_index().rename("Rows").rename_axis("Code")
+
+
+@lru_cache(maxsize=None)
+def default_countries():
+    return CountryIndex.from_csv()
+
+
+def main(argv=None):
+    """Print the nationality codes in the given CSVs (default: the records) that don't resolve."""
+    paths = argv or RECORDS
+    codes = pd.concat([pd.read_csv(path, usecols=["Nationality"])["Nationality"] for path in paths])
+    unresolved = default_countries().unresolved(codes)
+    if unresolved.empty:
+        print(f"All {codes.nunique()} nationality codes resolved")
+        return 0
+    print(unresolved.to_string())
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
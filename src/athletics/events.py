@@ -0,0 +1,97 @@
+""" events.py                                             yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Event taxonomy: which group (Sprints, Field, Relay, ...) an event is in.
+
+  The rules live in data/event_groups.csv rather than in code. Each rule is
+    either `regex` (searched in the lower-cased event name, first match in
+    file order wins) or `exact` (an event name, checked before any regex),
+    so a single event can be overridden without touching the patterns.
+    Anything no rule matches is 'Other'.
+
+  EventTaxonomy.classify() factorises a column of events, resolves each
+    distinct name once (and remembers it), and hands back a categorical built
+    from the codes, so classifying millions of rows costs O(unique events).
+    export() writes the resolved mapping as `exact` rules, ready to edit and
+    load back in.
+"""
+
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .paths import DAT
+
+RULES = DAT + "event_groups.csv"
+DEFAULT_GROUP = "Other"
+
+
+class EventTaxonomy:
+    """Ordered event -> group rules with a cache of resolved names."""
+
+    def __init__(self, rules):
+        rules = pd.DataFrame(rules, columns=["kind", "pattern", "group"])
+        bad = set(rules["kind"]) - {"regex", "exact"}
+        if bad:
+            raise ValueError(f"Unknown event rule kind(s): {', '.join(sorted(bad))}")
+        self.rules = rules.reset_index(drop=True)
+        self.exact = {}
+        for event, group in zip(rules.loc[rules["kind"] == "exact", "pattern"],
+                                rules.loc[rules["kind"] == "exact", "group"]):
+            self.exact.setdefault(event, group)  # earlier rules win
+        self.patterns = [(re.compile(pattern), group) for pattern, group in
+                         zip(rules.loc[rules["kind"] == "regex", "pattern"],
+                             rules.loc[rules["kind"] == "regex", "group"])]
+        self.groups = sorted(set(rules["group"]) | {DEFAULT_GROUP})
+        self.cache = {}
+
+    @classmethod
+    def from_csv(cls, path=RULES):
+        return cls(pd.read_csv(path, dtype=str, keep_default_na=False))
+
+    def group(self, event):
+        """Group of a single event name."""
+        if event not in self.cache:
+            self.cache[event] = self._resolve(event)
+        return self.cache[event]
+
+    def _resolve(self, event):
+        if event in self.exact:
+            return self.exact[event]
+        event_lower = str(event).lower()
+        for pattern, group in self.patterns:
+            if pattern.search(event_lower):
+                return group
+        return DEFAULT_GROUP
+
+    def classify(self, events):
+        """Categorical of groups for a column of events, on its index."""
+        events = pd.Series(events)
+        codes, uniques = pd.factorize(events, use_na_sentinel=False)
+        lookup = {group: i for i, group in enumerate(self.groups)}
+        group_codes = np.array([lookup[self.group(event)] for event in uniques], dtype=np.int8)
+        return pd.Series(pd.Categorical.from_codes(group_codes[codes], categories=self.groups),
+                         index=events.index, name="Group")
+
+    def export(self, path, events=None):
+        """Write the mapping for events (default: every event seen) as exact rules."""
+        events = list(self.cache) if events is None else list(dict.fromkeys(events))
+        pd.DataFrame({"kind": "exact", "pattern": events,
+                      "group": [self.group(event) for event in events]}).to_csv(path, index=False)
+
+    def override(self, mapping):
+        """A new taxonomy with exact event -> group rules put in front."""
+        extra = pd.DataFrame({"kind": "exact", "pattern": list(mapping), "group": list(mapping.values())})
+        return EventTaxonomy(pd.concat([extra, self.rules], ignore_index=True))
+
+
+@lru_cache(maxsize=None)
+def default_taxonomy():
+    return EventTaxonomy.from_csv()
+
+
+# Separate events into their types:
+def classify_event(event):
+    return default_taxonomy().group(event)
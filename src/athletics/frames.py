@@ -0,0 +1,84 @@
+""" frames.py                                             yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Typed columnar cache of the prepared frames.
+
+  Building df_men/df_women/keely means reading five CSVs as text, merging,
+    classifying and parsing dates. The finished frames are written as
+    uncompressed Feather (Arrow IPC) files, which keep datetime and
+    categorical dtypes, and later runs memory-map them back instead.
+
+  Files are named <frame>-<key>.feather, where the key hashes the source
+    CSVs and the preparation code, so editing either simply misses the cache
+    (and the stale file is replaced). pyarrow is optional: without it the
+    frames are always built from the CSVs.
+"""
+
+import glob
+import hashlib
+import os
+
+from .cache import file_digest
+from .instrument import span
+from .paths import DAT
+
+FRAMES = DAT + ".frames/"
+
+
+def _pyarrow():
+    try:
+        import pyarrow.feather
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def frames_key(sources):
+    h = hashlib.sha256()
+    for path in sources:
+        h.update(path.encode())
+        h.update(file_digest(path).encode())
+    return h.hexdigest()[:16]
+
+
+def _build(names, build):
+    with span("build " + "+".join(names), "prepare") as built:
+        frames = build()
+        built.rows = sum(len(df) for df in frames)
+    return frames
+
+
+def cached_frames(names, sources, build, root=FRAMES):
+    """Return build()'s frames, from the Feather cache when it is current.
+
+    names labels each frame build() returns; sources are the files (data and
+    code) that, if changed, make the cached copies stale.
+    """
+    pa = _pyarrow()
+    if pa is None:
+        return _build(names, build)
+
+    key = frames_key(sources)
+    paths = [f"{root}{name}-{key}.feather" for name in names]
+    if all(os.path.exists(path) for path in paths):
+        # memory_map avoids reading the files into a buffer before converting
+        with span("read " + "+".join(names), "io") as read:
+            frames = tuple(pa.feather.read_table(path, memory_map=True).to_pandas() for path in paths)
+            read.rows = sum(len(df) for df in frames)
+        return frames
+
+    frames = _build(names, build)
+    os.makedirs(root, exist_ok=True)
+    for name, path, df in zip(names, paths, frames):
+        # Parallel stages may be writing the same file; each writes its own
+        # temporary copy and the last rename wins
+        for stale in set(glob.glob(f"{root}{name}-*.feather")) - {path}:
+            try:
+                os.remove(stale)
+            except FileNotFoundError:
+                pass
+        table = pa.Table.from_pandas(df, preserve_index=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        pa.feather.write_feather(table, tmp, compression="uncompressed")
+        os.replace(tmp, path)
+    return frames
@@ -0,0 +1,176 @@
+""" gender_gap.py                                         yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Section (4), Figure 2: gender gap across events.
+
+  gender_gaps() lines the men's and women's records up on Event in one join,
+    so every event both lists share gets a gap, and works the percentage out
+    for all of them at once. The direction follows the unit: for timed events
+    (seconds) the women's mark is the larger one, for measured events (metres,
+    points) the men's. Figure 2 shows the gap_time + gap_dist selection.
+
+  gap_history() does the same over record progressions: the gap per event at
+    every date on which either record changed. record_gaps() runs it over
+    the RecordStore (current plus superseded records), and
+    plot_gap_history() draws how the gap has moved for the Figure 2 events.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .paths import AS_OF, FIG
+from .plotting import figure
+from .progression import running_best
+
+# Separate into time measured / distance measured:
+gap_time = ['100 m', '200 m', '800 m', '5000 m', '10,000 m', 'Half marathon', 'Marathon']
+gap_dist = ['High jump', 'Long jump', 'Pole vault', 'Javelin throw', 'Discus throw', 'Hammer throw']
+
+COLOURS = {'s': 'mediumslateblue', 'm': 'seagreen', 'pts': 'seagreen'}
+MARK = ['Event', 'Performance_value', 'Performance_unit']
+
+
+def percentage_gap(men, women, unit):
+    """% by which men's marks better women's: lower is better in seconds, higher otherwise."""
+    men = np.asarray(men, dtype=float)
+    women = np.asarray(women, dtype=float)
+    timed = np.asarray(unit) == 's'
+    return np.where(timed, ((women - men) / men) * 100, ((men - women) / women) * 100)
+
+
+def _marks(df):
+    # First listed record of each event, with plain string events so the two
+    # genders' categoricals can be joined
+    marks = df.drop_duplicates('Event')[MARK]
+    return marks.assign(Event=marks['Event'].astype(str),
+                        Performance_unit=marks['Performance_unit'].astype(str))
+
+
+def gender_gaps(df_men, df_women, events=None):
+    """Gender gap for every event both frames have in the same unit.
+
+    Events are in df_men's order, or in the order given (missing ones are
+    skipped). Returns Event, Gender_Gap (%) and the bar Color.
+    """
+    both = _marks(df_men).merge(_marks(df_women), on='Event', suffixes=('_men', '_women'))
+    both = both[(both['Performance_unit_men'] == both['Performance_unit_women'])
+                & both['Performance_unit_men'].isin(list(COLOURS))]
+    if events is not None:
+        both = both.set_index('Event').reindex(events).dropna(subset=['Performance_unit_men']).reset_index()
+
+    unit = both['Performance_unit_men']
+    return pd.DataFrame({
+        'Event': both['Event'].to_numpy(),
+        'Gender_Gap': percentage_gap(both['Performance_value_men'], both['Performance_value_women'], unit),
+        'Color': unit.map(COLOURS).to_numpy(),
+    })
+
+
+def gender_gap(df_men, df_women):
+    """Percentage by which each men's record betters the women's record."""
+    # Calculate % diffs for track & field:
+    return gender_gaps(df_men, df_women, gap_time + gap_dist)
+
+
+def _best_so_far(progression):
+    # Record standing after each row: running min of times, max of distances/points
+    df = (progression[MARK + ['Date']].dropna(subset=['Date', 'Performance_value'])
+          .assign(Event=lambda d: d['Event'].astype(str),
+                  Performance_unit=lambda d: d['Performance_unit'].astype(str))
+          .sort_values('Date', kind='stable'))
+    df['Record'] = running_best(df['Performance_value'], df['Performance_unit'], df['Event'])
+    return df[['Event', 'Date', 'Performance_unit', 'Record']]
+
+
+def gap_history(prog_men, prog_women):
+    """Gender gap per event at each date either gender's record changed.
+
+    prog_men/prog_women are record progressions: Event, Date,
+    Performance_value and Performance_unit, one row per record. Dates before
+    both genders have a record are left out.
+    """
+    men = _best_so_far(prog_men)
+    women = _best_so_far(prog_women)
+    dates = (pd.concat([men[['Event', 'Date']], women[['Event', 'Date']]])
+             .drop_duplicates().sort_values('Date', kind='stable'))
+
+    # Standing record of each gender on every date, by as-of join per event:
+    history = pd.merge_asof(dates, men, on='Date', by='Event')
+    history = pd.merge_asof(history, women, on='Date', by='Event', suffixes=('_men', '_women'))
+    history = history.dropna(subset=['Record_men', 'Record_women'])
+    history = history[history['Performance_unit_men'] == history['Performance_unit_women']]
+
+    return pd.DataFrame({
+        'Event': history['Event'].to_numpy(),
+        'Date': history['Date'].to_numpy(),
+        'Men': history['Record_men'].to_numpy(),
+        'Women': history['Record_women'].to_numpy(),
+        'Unit': history['Performance_unit_men'].to_numpy(),
+        'Gender_Gap': percentage_gap(history['Record_men'], history['Record_women'],
+                                     history['Performance_unit_men']),
+    }).sort_values(['Event', 'Date'], kind='stable', ignore_index=True)
+
+
+def record_gaps(store, events=None):
+    """gap_history() of a RecordStore's men's and women's records, for the
+    given events (all by default)."""
+    records = store.records
+    history = gap_history(records[records['Gender'] == 'Male'], records[records['Gender'] == 'Female'])
+    if events is not None:
+        history = history[history['Event'].isin(events)].reset_index(drop=True)
+    return history
+
+
+def plot_gap_history(history, path=FIG + "gender_gap_history.png", as_of=AS_OF):
+    # One step line per event, held level from its last change up to as_of:
+    with figure(path, figsize=(14, 10)) as fig:
+        axes = fig.subplots(2, 1, sharex=True)
+        for ax, events, kind in [(axes[0], gap_time, 'Track (Timed) Events'),
+                                 (axes[1], gap_dist, 'Field (Measured) Events')]:
+            for event in events:
+                gaps = history[history['Event'] == event]
+                if gaps.empty:
+                    continue
+                dates = list(gaps['Date']) + [pd.Timestamp(as_of)]
+                values = list(gaps['Gender_Gap']) + [gaps['Gender_Gap'].iloc[-1]]
+                ax.step(dates, values, where='post', label=event)
+            ax.set_title(f"Gender Gap in World Records Over Time: {kind}")
+            ax.set_ylabel("Performance Gap of Men's Record \nBettering Women's Record (%)")
+            ax.grid(linestyle='--', alpha=0.7)
+            ax.legend(loc='best', fontsize=9)
+        axes[1].set_xlabel("Date")
+        fig.tight_layout()
+
+
+def plot_gender_gap(gender_gap_df, path=FIG + "gender_gap.png"):
+    from matplotlib.patches import Patch
+
+    # Plot (saved to path at the end of the block):
+    with figure(path, figsize=(14, 6)) as fig:
+        ax = fig.add_subplot()
+        bars = ax.bar(gender_gap_df['Event'], gender_gap_df['Gender_Gap'], color=gender_gap_df['Color'])
+
+        # Labels:
+        for bar in bars:
+            yval = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width()/2, yval + 0.01, f"{yval:.2f}%", ha='center', va='bottom', fontsize=9)
+
+        # y = 0 marker:
+        ax.axhline(y=0, color='red', linestyle='dashed')
+
+        # Legend:
+        legend_elements = [
+            Patch(facecolor='red', label='Equal Performance'),
+            Patch(facecolor='mediumslateblue', label='Track (Timed) Events'),
+            Patch(facecolor='seagreen', label='Field (Measured) Events')
+        ]
+        ax.legend(handles=legend_elements, loc="best")
+
+        # Formatting:
+        ax.set_xlabel("Event")
+        ax.set_ylabel("Performance Gap of Men's Record \nBettering Women's Record (%)")
+        ax.set_title("Gender Gap in Athletics World Records (Track & Field Events)")
+        ax.set_ylim(min(gender_gap_df['Gender_Gap']) - 10, max(gender_gap_df['Gender_Gap']) + 10)
+        for label in ax.get_xticklabels():
+            label.set_rotation(45)
+        fig.tight_layout()
@@ -0,0 +1,162 @@
+""" ingest.py                                             yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Streaming ingest of performance logs in the keely_data.csv layout
+    (Event,Perf,Indoor,Venue,Meeting,Date, plus any other columns such as
+    Athlete), however large.
+
+  read_log() reads the CSV a chunk at a time. Each chunk's strings arrive as
+    categoricals, so the indoor/event/meeting filters are decided once per
+    distinct value and applied to the codes before anything is parsed; only
+    the surviving rows have their dates and marks parsed, both vectorised
+    over the chunk. ingest() appends each prepared chunk to a LogStore, a
+    directory of Feather (Arrow IPC) part files, so memory stays at about
+    one chunk whatever the size of the log.
+
+      python3 -m athletics.ingest LOG.csv STORE [--events 800] [--meetings "Diamond League"]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from .meetings import MeetingTiers
+from .performance import normalize_performance
+from .schema import CSV_DTYPES, compact, concat
+
+DATE_FORMAT = "%d-%b-%y"
+CHUNKSIZE = 1 << 18
+TEXT = {"Perf": str, "Indoor": str, "Date": str}
+
+
+def _where(series, test):
+    """Rows whose value passes test, deciding each distinct value once."""
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype("category")
+    passed = np.array([bool(test(value)) for value in series.cat.categories] + [False])
+    return passed[series.cat.codes.to_numpy()]  # code -1 (missing) picks the False
+
+
+def log_filter(chunk, indoor=False, events=None, meetings=None):
+    """Boolean mask of the chunk rows to keep.
+
+    indoor=False keeps outdoor marks only, True indoor only, None both.
+    events lists the events to keep (exact names); meetings keeps rows whose
+    meeting contains any of the given strings (ignoring case).
+    """
+    keep = np.ones(len(chunk), dtype=bool)
+    if indoor is not None and "Indoor" in chunk:
+        keep &= chunk["Indoor"].notna().to_numpy() == indoor
+    if events is not None:
+        events = {str(event) for event in events}
+        keep &= _where(chunk["Event"], lambda event: str(event) in events)
+    if meetings is not None:
+        tiers = MeetingTiers(meetings)
+        keep &= tiers.codes(chunk["Meeting"]) < len(tiers.tiers)
+    return keep
+
+
+def prepare_log(chunk, date_format=DATE_FORMAT):
+    """Parse a filtered chunk's dates and marks (Date, Perf_seconds)."""
+    chunk = chunk.copy()
+    for col in chunk.select_dtypes("category"):
+        chunk[col] = chunk[col].cat.remove_unused_categories()
+    chunk['Date'] = pd.to_datetime(chunk['Date'], format=date_format, errors="coerce")
+    chunk['Perf_seconds'] = normalize_performance(chunk['Perf'])['value']
+    return chunk
+
+
+def read_log(path, chunksize=CHUNKSIZE, columns=None, date_format=DATE_FORMAT, **filters):
+    """Yield the prepared rows of a performance log CSV, a chunk at a time.
+
+    columns limits the columns read (those filtered on are always read);
+    filters are log_filter()'s indoor/events/meetings. If no row passes,
+    one empty prepared chunk is yielded, so callers still get the log's
+    columns and dtypes.
+    """
+    usecols = None
+    if columns is not None:
+        wanted = set(columns) | {"Perf", "Date", "Indoor", "Event", "Meeting"}
+        usecols = wanted.__contains__  # a callable, so columns the log lacks are no error
+    chunk, kept = None, 0
+    with pd.read_csv(path, dtype={**CSV_DTYPES, **TEXT}, usecols=usecols, chunksize=chunksize) as reader:
+        for chunk in reader:
+            chunk = chunk[log_filter(chunk, **filters)]
+            if len(chunk):
+                kept += len(chunk)
+                yield prepare_log(chunk, date_format)
+    if not kept and chunk is not None:
+        yield prepare_log(chunk, date_format)  # no rows, but the columns and dtypes
+
+
+class LogStore:
+    """Append-only columnar store: a directory of numbered Feather parts."""
+
+    def __init__(self, root):
+        try:
+            import pyarrow.feather
+        except ImportError:
+            raise ImportError("LogStore needs pyarrow to write Feather files") from None
+        self.feather = pyarrow.feather
+        self.root = root.rstrip("/") + "/"
+        os.makedirs(self.root, exist_ok=True)
+
+    def parts(self):
+        return sorted(glob.glob(self.root + "part-*.feather"))
+
+    def append(self, df):
+        """Write df as the next part; returns its path."""
+        path = f"{self.root}part-{len(self.parts()):06d}.feather"
+        self.feather.write_feather(df.reset_index(drop=True), path + ".tmp", compression="uncompressed")
+        os.replace(path + ".tmp", path)
+        return path
+
+    def scan(self, columns=None):
+        """Yield the parts one at a time as DataFrames."""
+        for path in self.parts():
+            yield compact(self.feather.read_table(path, columns=columns, memory_map=True).to_pandas())
+
+    def read(self, columns=None):
+        """The whole store as one DataFrame, categoricals unioned across parts."""
+        return concat(self.scan(columns), empty=pd.DataFrame(columns=columns), ignore_index=True)
+
+    def clear(self):
+        for path in self.parts():
+            os.remove(path)
+
+
+def ingest(path, store, chunksize=CHUNKSIZE, **options):
+    """Stream a log CSV into store (a LogStore); returns the rows appended."""
+    rows = 0
+    for chunk in read_log(path, chunksize, **options):
+        if len(chunk):
+            store.append(chunk)
+            rows += len(chunk)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="athletics.ingest",
+                                     description="Stream a performance log CSV into a Feather store.")
+    parser.add_argument("log", help="CSV in the keely_data.csv layout")
+    parser.add_argument("store", help="directory of Feather parts to append to")
+    parser.add_argument("--events", nargs="*", help="events to keep (default: all)")
+    parser.add_argument("--meetings", nargs="*", help="keep meetings containing any of these")
+    parser.add_argument("--indoor", choices=["no", "yes", "both"], default="no")
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    rows = ingest(args.log, LogStore(args.store), args.chunksize, events=args.events,
+                  meetings=args.meetings, indoor={"no": False, "yes": True, "both": None}[args.indoor])
+    print(f"{rows} rows appended in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
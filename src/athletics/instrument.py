@@ -0,0 +1,140 @@
+""" instrument.py                                         yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Opt-in profiling of a pipeline run.
+
+  Code marks its expensive steps with span(): each stage as a whole, and
+    inside them the page fetch, the HTML parse, preparing the frames, model
+    fits and saving figures. With no Profiler running a span does nothing;
+    with one running it records wall time, CPU time, peak traced allocation
+    (tracemalloc, measured from the start of the span) and the number of
+    rows the step handled, if it says.
+
+  Profiler.write() saves the spans as a Chrome trace (load it in
+    chrome://tracing or https://ui.perfetto.dev), with the measurements in
+    each event's args so runs can be compared after a data refresh;
+    summary() totals them per step.
+
+      python3 -m athletics --force --profile profile.json
+"""
+
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+_active = None  # the Profiler recording in this process, if any
+
+
+class Span:
+    """What a span has measured so far; set rows from inside the block."""
+
+    __slots__ = ("name", "cat", "rows", "start", "wall", "cpu", "peak", "depth")
+
+    def __init__(self, name, cat, rows=None):
+        self.name, self.cat, self.rows = name, cat, rows
+        self.start = self.wall = self.cpu = 0.0
+        self.peak = self.depth = 0
+
+
+class Profiler:
+    """Collects spans from this process (and from worker processes via extend())."""
+
+    def __init__(self, memory=True):
+        self.memory = memory
+        self.events = []
+        self._open = []  # spans in progress, with the peak their children reached
+        self._started_tracing = False
+
+    def start(self):
+        global _active
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        _active = self
+        return self
+
+    def stop(self):
+        global _active
+        if _active is self:
+            _active = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return self
+
+    @contextmanager
+    def span(self, name, cat="step", rows=None):
+        record = Span(name, cat, rows)
+        record.depth = len(self._open)
+        base = 0
+        if self.memory:
+            # The peak is reset per span; a parent's peak is the larger of its
+            # own and its children's, which the reset would otherwise lose
+            base, peak = tracemalloc.get_traced_memory()
+            if self._open:
+                self._open[-1][1] = max(self._open[-1][1], peak)
+            tracemalloc.reset_peak()
+        self._open.append([record, 0])
+        record.start = time.time()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record.wall = time.perf_counter() - wall
+            record.cpu = time.process_time() - cpu
+            _, children = self._open.pop()
+            if self.memory:
+                peak = max(tracemalloc.get_traced_memory()[1], children)
+                record.peak = peak - base
+                if self._open:
+                    self._open[-1][1] = max(self._open[-1][1], peak)
+            self.events.append({"name": record.name, "cat": record.cat, "pid": os.getpid(),
+                                "start": record.start, "wall": record.wall, "cpu": record.cpu,
+                                "peak": record.peak, "rows": record.rows, "depth": record.depth})
+
+    def extend(self, events):
+        self.events.extend(events)
+
+    def trace(self):
+        """The spans as Chrome trace ("X" complete) events."""
+        return {"displayTimeUnit": "ms", "traceEvents": [
+            {"name": e["name"], "cat": e["cat"], "ph": "X", "pid": e["pid"], "tid": e["pid"],
+             "ts": round(e["start"] * 1e6), "dur": round(e["wall"] * 1e6),
+             "args": {"cpu_ms": round(e["cpu"] * 1e3, 3), "peak_bytes": e["peak"], "rows": e["rows"]}}
+            for e in sorted(self.events, key=lambda e: e["start"])]}
+
+    def write(self, path):
+        with open(path, "w") as f:
+            json.dump(self.trace(), f, indent=1)
+
+    def summary(self):
+        """Text table of calls, wall/CPU seconds, peak MB and rows per span name."""
+        totals = {}
+        for e in sorted(self.events, key=lambda e: e["start"]):
+            t = totals.setdefault((e["cat"], e["name"]), {"calls": 0, "wall": 0.0, "cpu": 0.0, "peak": 0, "rows": None})
+            t["calls"] += 1
+            t["wall"] += e["wall"]
+            t["cpu"] += e["cpu"]
+            t["peak"] = max(t["peak"], e["peak"])
+            if e["rows"] is not None:
+                t["rows"] = (t["rows"] or 0) + e["rows"]
+        lines = [f"{'span':<24} {'kind':<7} {'calls':>5} {'wall s':>8} {'cpu s':>8} {'peak MB':>8} {'rows':>9}"]
+        for (cat, name), t in totals.items():
+            rows = "" if t["rows"] is None else t["rows"]
+            lines.append(f"{name:<24} {cat:<7} {t['calls']:>5} {t['wall']:>8.3f} {t['cpu']:>8.3f} "
+                         f"{t['peak'] / 1e6:>8.2f} {rows:>9}")
+        return "\n".join(lines)
+
+
+@contextmanager
+def _untimed(name, cat, rows):
+    yield Span(name, cat, rows)
+
+
+def span(name, cat="step", rows=None):
+    """Time the block under name if a Profiler is running (a no-op otherwise)."""
+    if _active is None:
+        return _untimed(name, cat, rows)
+    return _active.span(name, cat, rows)
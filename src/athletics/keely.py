@@ -0,0 +1,178 @@
+""" keely.py                                              yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Sections (9)-(10): case study of Keely Hodgkinson's 800m times.
+    (9)  Scatter plot of all of her 800m times, coloured by meeting.
+    (10) Trend in her Diamond League times, OLS regression, and the
+         predicted world-record date with a confidence interval.
+    Also a table of her personal-best progression and season bests.
+
+  Data in keely_data.csv is from The Power of 10, "Athlete Profile: Keely
+    Hodgkinson", https://www.thepowerof10.info/athletes/profile.aspx?athleteid=525443.
+"""
+
+import warnings
+
+import pandas as pd
+
+from .instrument import span
+from .meetings import MeetingTiers
+from .paths import FIG, TAB
+from .plotting import figure, seconds_to_time_format
+from .query import FrameIndex
+
+# Define colours for each event:
+event_colours = {
+    'Olympic Games': 'gold',
+    'World Athletics Championships': 'blue',
+    'Diamond League': 'green',
+    'European Athletics': 'purple',
+    'UK Athletics': 'hotpink',
+    'Commonwealth Games': 'red'
+}
+default_colour = 'gray'
+
+# Each meeting's category, matched once per distinct meeting name and shared
+# by both figures:
+meeting_tiers = MeetingTiers(event_colours)
+
+# Current WR in seconds (1:53.28):
+record = 113.28
+
+
+def log_index(keely):
+    """FrameIndex of a performance log, with each meeting's tier as the Tier key."""
+    return FrameIndex(keely, extra={'Tier': meeting_tiers.classify(keely['Meeting'])})
+
+#------------------------------------------------------------------------------
+#--- (9) Scatter Plot of all of Keely Hodgkinson's 800m times
+#------------------------------------------------------------------------------
+
+def plot_keely_all(keely, path=FIG + "keely_all.png", index=None):
+    import matplotlib.dates as mdates
+    from matplotlib.ticker import FuncFormatter
+
+    # Races by category of meeting:
+    index = log_index(keely) if index is None else index
+
+    # Plot (saved to path at the end of the block):
+    with figure(path, figsize=(12, 7)) as fig:
+        ax = fig.add_subplot()
+
+        # Plot significant events:
+        for event, colour in event_colours.items():
+            subset = index.rows(Tier=event)
+            ax.scatter(subset['Date'], subset['Perf_seconds'], label=event, color=colour)
+
+        # Plot all others:
+        other_subset = index.rows(Tier=meeting_tiers.other)
+        ax.scatter(other_subset['Date'], other_subset['Perf_seconds'], label='Other Events', color=default_colour)
+
+        # Format:
+        ax.yaxis.set_major_formatter(FuncFormatter(seconds_to_time_format))
+        ax.xaxis.set_major_formatter(mdates.DateFormatter('%b %Y'))
+        ax.set_xlabel("Date")
+        ax.set_ylabel("Performance (Minutes:Seconds)")
+        ax.set_title("Keely Hodgkinson's 800m Performances by Meeting")
+        ax.legend()
+        ax.grid(True)
+        fig.tight_layout()
+
+#------------------------------------------------------------------------------
+#--- (10) Trend in Keely Hodkindon's Diamond League times, OLS regression
+#------------------------------------------------------------------------------
+
+def diamond_league(keely, index=None):
+    # Filter for Diamond League:
+    index = log_index(keely) if index is None else index
+    return index.rows(Tier="Diamond League")
+
+
+def fit_trend(keely_DL):
+    """OLS of Perf_seconds on matplotlib date numbers."""
+    import matplotlib.dates as mdates
+    import statsmodels.api as sm
+
+    # Convert dates to numeric and do OLS regression:
+    x_numeric = mdates.date2num(keely_DL['Date'])
+    X = sm.add_constant(x_numeric)
+    Y = keely_DL['Perf_seconds']
+    with span("ols fit", "model", rows=len(Y)):
+        return sm.OLS(Y, X).fit()
+
+
+def keely_trends(keely, index=None):
+    """Batched trend fits of all her outdoor races and the Diamond League ones."""
+    from .trends import fit_trends
+
+    races = pd.concat([keely.assign(Races="All outdoor"),
+                       diamond_league(keely, index).assign(Races="Diamond League")])
+    return fit_trends(races, by="Races", record=record)
+
+
+def keely_bests(keely):
+    """Her personal-best progression and her best time each season."""
+    from .toplists import SeasonLists
+
+    lists = SeasonLists(n=1, athlete=None)
+    progression = keely[lists.update(keely)].sort_values('Date', kind='stable')
+    return progression, lists.toplists()
+
+
+def write_keely_bests(progression, seasons, path=TAB + "keely_bests.html"):
+    columns = ['Date', 'Perf', 'Meeting', 'Venue']
+
+    # Both tables on one page:
+    with open(path, "w") as f:
+        f.write("<h3>Personal bests</h3>\n")
+        f.write(progression[columns].assign(Date=progression['Date'].dt.date).to_html(index=False, border=1))
+        f.write("\n<h3>Season bests</h3>\n")
+        f.write(seasons[['Season'] + columns].assign(Date=seasons['Date'].dt.date).to_html(index=False, border=1))
+
+
+def write_keely_summary(model, path=TAB + "keely_summary.html"):
+    # To remove warning message here for clean output:
+    warnings.filterwarnings("ignore", message="`kurtosistest` p-value may be inaccurate with fewer than 20 observations")
+
+    # Save summary table as an HTML file:
+    with open(path, "w") as f:
+        f.write("<html>\n<head><title>Model Summary</title></head>\n<body>\n")
+        f.write("<pre>\n")
+        f.write(model.summary().as_text())
+        f.write("\n</pre>\n</body>\n</html>")
+
+
+def plot_keely_DL(keely_DL, model, path=FIG + "keely_DL.png"):
+    import numpy as np
+    import matplotlib.dates as mdates
+    from matplotlib.ticker import FuncFormatter
+
+    # Trend line function:
+    coeffs = model.params
+    trend_line = np.poly1d([coeffs.iloc[1], coeffs.iloc[0]])
+
+    # Find intersection with the current WR:
+    intersect_date = mdates.num2date((record - coeffs.iloc[0]) / coeffs.iloc[1])
+
+    # Make sure LOBF goes across the right x-axis range:
+    extended_dates = pd.date_range(start='2021-01-01', end='2026-01-01', freq='ME')
+    extended_x_numeric = mdates.date2num(extended_dates)
+
+    # Plot (saved to path at the end of the block):
+    with figure(path, figsize=(12, 7)) as fig:
+        ax = fig.add_subplot()
+        ax.scatter(keely_DL['Date'], keely_DL['Perf_seconds'], label="Diamond League", color="green")
+        ax.plot(extended_dates, trend_line(extended_x_numeric), color='black', linestyle='--', label="Trend Line")
+        ax.axhline(y = record, color='red', linestyle='dotted', label="World Record (1:53.28)")
+
+        # Add annotation:
+        ax.annotate(f"Predicted WR:\n{intersect_date.date()}", xy=(intersect_date, record), xytext=(intersect_date, record + 0.1), fontsize=10, ha='left')
+
+        # Format axes & plot:
+        ax.yaxis.set_major_formatter(FuncFormatter(seconds_to_time_format))
+        ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y"))
+        ax.set_xlabel("Date")
+        ax.set_ylabel("Performance (Minutes:Seconds)")
+        ax.set_title("Keely Hodgkinson's Diamond League 800m Performances")
+        ax.legend()
+        ax.grid(True)
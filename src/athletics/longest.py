@@ -0,0 +1,61 @@
+""" longest.py                                            yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Section (8), Figure 5: length of time each record has stood, men & women.
+
+  Takes the records standing on the reference date as_of and how long each
+    has stood by then, in years, from RecordStore.longest_reigns() (see
+    progression.py).
+"""
+
+import pandas as pd
+
+from .paths import AS_OF, FIG
+from .plotting import figure
+
+
+# Get data ready for plots - filter, get year & sort:
+def plot_df(store, gender, as_of=AS_OF):
+    from matplotlib import colormaps
+    reigns = store.longest_reigns(as_of, gender=gender)  # longest first
+    standing = reigns[reigns['End'].isna() | (reigns['End'] > pd.Timestamp(as_of))]
+    df_sort = standing[standing['Group'] != 'Other'].rename(columns={'Years': 'Years Since'})
+    groups = df_sort['Group'].astype('category').cat.remove_unused_categories()
+    group_codes = groups.cat.codes
+    colours = colormaps["tab10"](group_codes % 10)
+    return df_sort, groups, colours
+
+
+def plot_longest_records(store, path=FIG + "longest_records.png", as_of=AS_OF):
+    from matplotlib import colormaps
+    from matplotlib.patches import Rectangle
+
+    df_men_sort, men_groups, men_colours = plot_df(store, "Male", as_of)
+    df_women_sort, women_groups, women_colours = plot_df(store, "Female", as_of)
+
+    # Subplots (saved to path at the end of the block):
+    with figure(path, figsize=(18, 10)) as fig:
+        axes = fig.subplots(1, 2, sharex=True)
+
+        # Men's Plot:
+        axes[0].barh(df_men_sort['Event'], df_men_sort['Years Since'], color=men_colours, alpha=0.8)
+        axes[0].set_title('Men\'s Longest Standing World Records', fontsize = 14)
+        axes[0].set_xlabel('Years Since Record Was Set')
+        axes[0].invert_yaxis()
+        axes[0].grid(axis='x', linestyle='--', alpha=0.7)
+
+        # Women's Plot:
+        axes[1].barh(df_women_sort['Event'], df_women_sort['Years Since'], color=women_colours, alpha=0.8)
+        axes[1].set_title('Women\'s Longest Standing World Records', fontsize = 14)
+        axes[1].set_xlabel('Years Since Record Was Set')
+        axes[1].invert_yaxis()
+        axes[1].grid(axis='x', linestyle='--', alpha=0.7)
+
+        # Legend:
+        all_groups = sorted(set(men_groups.cat.categories) | set(women_groups.cat.categories))
+        legend_colors = [colormaps["tab10"](i % 10) for i in range(len(all_groups))]
+        handles = [Rectangle((0, 0), 1, 1, color=color, alpha=0.8)
+                   for color in legend_colors]
+        fig.legend(handles, all_groups, title='Event Type', loc='upper center', ncol=len(all_groups))
+
+        fig.tight_layout(rect=[0, 0, 1, 0.95])
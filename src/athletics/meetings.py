@@ -0,0 +1,59 @@
+""" meetings.py                                           yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Meeting tiers: which kind of meeting (Olympic Games, Diamond League, ...)
+    each result came from, judged by its meeting name.
+
+  A meeting belongs to the first tier whose name appears in it, ignoring
+    case, and to "Other" if none does. All the tier names are compiled into
+    one regular expression, one group per tier inside a lookahead: it
+    matches without consuming at every position where some tier starts, so
+    a tier overlapping a lower-priority one's match is still seen, and a
+    meeting name is scanned once however many tiers there are. Names are
+    classified once each and remembered, so a column of results costs one
+    factorise plus a lookup per distinct meeting not seen before.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+OTHER = "Other"
+
+
+class MeetingTiers:
+    """Meeting name -> tier, the first of tiers contained in the name."""
+
+    def __init__(self, tiers, other=OTHER):
+        self.tiers = list(tiers)
+        self.other = other
+        self.categories = self.tiers + [other]
+        self.pattern = re.compile("(?=" + "|".join(f"({re.escape(tier)})" for tier in self.tiers) + ")",
+                                  re.IGNORECASE)
+        self.seen = {}
+
+    def _tier(self, name):
+        # Group numbers follow the tiers. Each match is the first tier starting at
+        # its position, so the lowest over all positions is the first tier anywhere
+        groups = [match.lastindex for match in self.pattern.finditer(name)] if self.tiers else []
+        return min(groups) - 1 if groups else len(self.tiers)
+
+    def codes(self, meetings):
+        """Tier number of each meeting (len(tiers) for Other)."""
+        meetings = pd.Series(meetings)
+        if isinstance(meetings.dtype, pd.CategoricalDtype):
+            positions, uniques = meetings.cat.codes.to_numpy(), meetings.cat.categories
+        else:
+            positions, uniques = pd.factorize(meetings, use_na_sentinel=True)
+        for name in uniques:
+            if name not in self.seen:
+                self.seen[name] = self._tier(str(name))
+        tiers = np.array([self.seen[name] for name in uniques] + [len(self.tiers)], dtype=np.int64)
+        return tiers[positions]  # -1 (missing meeting) picks the Other on the end
+
+    def classify(self, meetings):
+        """Categorical tier of each meeting, on meetings' index."""
+        meetings = pd.Series(meetings)
+        return pd.Series(pd.Categorical.from_codes(self.codes(meetings), categories=self.categories),
+                         index=meetings.index, name="Tier")
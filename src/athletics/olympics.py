@@ -0,0 +1,114 @@
+""" olympics.py                                           yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Section (3), Figure 1: number of records broken in Olympic vs Non-Olympic
+    years, among the records standing on the reference date.
+
+  Olympic years come from the championship calendar (championships.py), and
+    olympic_effect() tests whether the Olympic share is more than chance.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .championships import cycle_lengths, join_calendar
+from .paths import FIG, TAB
+from .plotting import figure
+from .schema import concat
+
+
+def _year_counts(df):
+    # Records in / not in an Olympic year, from one calendar join
+    olympic_years = int(join_calendar(df)['Olympics'].sum())
+    non_olympic_years = len(df) - olympic_years
+    total_records = olympic_years + non_olympic_years
+    olympic_percentage = (olympic_years / total_records) * 100
+    non_olympic_percentage = (non_olympic_years / total_records) * 100
+    return [olympic_years, non_olympic_years], [olympic_percentage, non_olympic_percentage]
+
+
+def olympic_year_counts(df_men, df_women):
+    """Count records set in Olympic and non-Olympic years for each gender."""
+    men, men_percentage = _year_counts(df_men)
+    women, women_percentage = _year_counts(df_women)
+
+    # Data frame:
+    return pd.DataFrame({
+        'Category': ['Olympic Year', 'Non-Olympic Year'],
+        'Men': men,
+        'Men_Percentage': men_percentage,
+        'Women': women,
+        'Women_Percentage': women_percentage
+    })
+
+
+def olympic_effect(df_men, df_women, n_resamples=20000, seed=0, max_cells=1 << 24):
+    """Randomisation test of the Olympic-year effect, per gender and event group.
+
+    Under the null a record is equally likely to fall in any year of its
+    Olympic cycle, so it lands in the Olympic year with chance 1/cycle
+    length. All resamples are drawn as one (resamples x records) array (in
+    blocks of at most max_cells) and summed per gender/group with a matrix
+    product. p_value is the one-sided chance of at least the observed count.
+    """
+    records = concat([df_men.assign(Gender='Men'), df_women.assign(Gender='Women')], ignore_index=True)
+    olympic = join_calendar(records)['Olympics'].to_numpy(dtype=np.float64)
+    chance = 1.0 / cycle_lengths(records['Year'])
+
+    # One column per cell: each gender overall, then each gender x group
+    cells = [(gender, 'All') for gender in ('Men', 'Women')]
+    cells += [tuple(cell) for cell in records[['Gender', 'Group']].astype(str)
+              .drop_duplicates().sort_values(['Gender', 'Group']).to_numpy()]
+    gender = records['Gender'].to_numpy()
+    group = records['Group'].astype(str).to_numpy()
+    members = np.column_stack([(gender == g) & ((group == grp) | (grp == 'All')) for g, grp in cells])
+    members = members.astype(np.float64)
+
+    observed = olympic @ members
+    rng = np.random.default_rng(seed)
+    block = max(1, max_cells // max(len(records), 1))
+    at_least = np.zeros(len(cells))
+    for start in range(0, n_resamples, block):
+        draws = rng.random((min(block, n_resamples - start), len(records))) < chance
+        at_least += ((draws @ members) >= observed).sum(axis=0)
+
+    size = members.sum(axis=0)
+    return pd.DataFrame({
+        'Gender': [g for g, _ in cells],
+        'Group': [grp for _, grp in cells],
+        'Records': size.astype(int),
+        'Olympic_Year': observed.astype(int),
+        'Share': (observed / size * 100).round(1),
+        'Expected': (chance @ members / size * 100).round(1),
+        'p_value': ((at_least + 1) / (n_resamples + 1)).round(4),
+    })
+
+
+def write_olympic_test(df_test, path=TAB + "olympic_test.html"):
+    # Save:
+    with open(path, "w") as f:
+        f.write(df_test.to_html(index=False, border=1))
+
+
+def plot_olympic_years(year_data, path=FIG + "olympic_years.png"):
+    # Plotting (saved to path at the end of the block):
+    with figure(path) as fig:
+        ax = fig.add_subplot()
+        bar_width = 0.4
+        x = range(len(year_data['Category']))  # Positions for the bars
+
+        ax.bar(x, year_data['Men'], width=bar_width, label='Men', color='blue', alpha=0.8)
+        ax.bar([p + bar_width for p in x], year_data['Women'], width=bar_width, label='Women', color='pink', alpha=0.8)
+
+        # Annotations:
+        for i, (count, percentage) in enumerate(zip(year_data['Men'], year_data['Men_Percentage'])):
+            ax.text(i, count + 1, f'{count} ({percentage:.1f}%)', ha='center', fontsize=10, color='black')
+        for i, (count, percentage) in enumerate(zip(year_data['Women'], year_data['Women_Percentage'])):
+            ax.text(i + bar_width, count + 1, f'{count} ({percentage:.1f}%)', ha='center', fontsize=10, color='black')
+        ax.set_ylim(0, max(year_data['Men']) + 5)
+
+        # Format:
+        ax.set_xticks([p + bar_width / 2 for p in x], year_data['Category'])
+        ax.set_ylabel('Count')
+        ax.set_title('World Records Set in Olympic Years vs Non-Olympic Years (Men vs Women)')
+        ax.legend()
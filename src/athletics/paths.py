@@ -0,0 +1,34 @@
+""" paths.py                                              yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Directory and file locations shared by every stage of the athletics
+    pipeline.
+    The results directory can be redirected with the ATHLETICS_RESULTS
+    environment variable (useful for scratch builds that should not touch
+    the committed figures and tables).
+    ATHLETICS_AS_OF sets the reference date for "records standing on" and
+    "years since" (default: the day the record lists were scraped).
+"""
+
+import os
+
+# Had some issues detecting filepaths, so used this method instead of the typical one shown in lectures
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROOT = os.path.abspath(os.path.join(SRC, ".."))
+#ROOT = "C:/Users/DELL/Documents/UNI/Year_4/BEE2041 Data Science in Economics/rje215_project/"
+DAT  = ROOT+"/data/"
+RES  = os.environ.get("ATHLETICS_RESULTS", ROOT+"/results").rstrip("/")+"/"
+FIG  = RES+"figures/"
+TAB  = RES+"tables/"
+PKG  = SRC+"/athletics/"
+AS_OF = os.environ.get("ATHLETICS_AS_OF", "2025-04-09")
+
+# Files the prepared frames are built from; the build and frame caches are
+# keyed on these:
+RECORDS_DATA = (DAT + "world_records_men.csv", DAT + "world_records_women.csv",
+                DAT + "country-and-continent-codes-list-csv.csv", DAT + "country_aliases.csv",
+                DAT + "dobs.csv", DAT + "athlete_aliases.csv", DAT + "event_groups.csv")
+# Superseded records from the progression pages, added to the records in RecordStore:
+PROGRESSION_DATA = (DAT + "world_record_progression.csv",)
+KEELY_DATA = (DAT + "keely_data.csv",)
+PREPARE_CODE = tuple(PKG + module + ".py" for module in ("prepare", "performance", "events", "countries", "athletes", "schema", "ingest"))
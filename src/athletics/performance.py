@@ -0,0 +1,99 @@
+""" performance.py                                        yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Vectorised normalisation of performance strings.
+
+  normalize_performance() turns a column of marks into numbers and units in
+    one columnar pass:
+      "9.58", "1:40.91", "2:00:35", "3:29.63+"  ->  seconds ("s")
+      "8.95 m", "21,330 m"                       ->  metres  ("m")
+      "9126 pts"                                 ->  points  ("pts")
+    with a per-row error code instead of printed warnings. parse_speed() does
+    the same for the "Avg. speed mph (kmph)" column.
+
+  Full performance lists repeat the same marks many times, so each distinct
+    string is parsed once (pd.factorize) and the results are broadcast back
+    to the rows with an array take.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Per-row error codes:
+OK = 0
+MISSING = 1
+UNPARSED = 2
+
+UNITS = ["s", "m", "pts"]
+
+PERFORMANCE_RE = (
+    r"^\s*(?:"
+    r"(?:(?:(?P<h>\d+):)?(?P<min>\d+):)?(?P<sec>\d+(?:\.\d+)?)\s*[+*]?"  # h:mm:ss.ff, m:ss.ff, ss.ff
+    r"|(?P<dist>\d[\d,]*(?:\.\d+)?)\s*m"                                  # metres
+    r"|(?P<pts>\d[\d,]*)\s*pts"                                           # points
+    r")\s*$"
+)
+SPEED_RE = r"^\s*(?P<mph>\d+(?:\.\d+)?)\s*\(\s*(?P<kmph>\d+(?:\.\d+)?)\s*\)\s*$"
+
+
+def _number(parts):
+    return pd.to_numeric(parts.str.replace(",", "", regex=False)).to_numpy(dtype=float, na_value=np.nan)
+
+
+def _parse_unique(uniques):
+    # Parse an array of distinct strings -> (value, unit code, error code)
+    parts = pd.Series(uniques, dtype=object).str.extract(PERFORMANCE_RE)
+
+    sec = _number(parts["sec"])
+    value = (np.nan_to_num(_number(parts["h"])) * 3600
+             + np.nan_to_num(_number(parts["min"])) * 60 + sec)
+    unit = np.where(parts["sec"].notna(), 0, -1)
+
+    for code, col in [(1, "dist"), (2, "pts")]:
+        matched = parts[col].notna().to_numpy()
+        value = np.where(matched, _number(parts[col]), value)
+        unit = np.where(matched, code, unit)
+
+    error = np.where(unit >= 0, OK, UNPARSED)
+    return value, unit, error
+
+
+def normalize_performance(values):
+    """Parse performance strings into value / unit / error columns.
+
+    Returns a DataFrame on values' index with a float "value" (seconds, metres
+    or points), a categorical "unit" and an int8 "error" code (OK, MISSING or
+    UNPARSED); value and unit are missing wherever error is not OK.
+    """
+    values = pd.Series(values)
+    stripped = values.astype("string").str.strip().replace("", pd.NA)
+    codes, uniques = pd.factorize(stripped, use_na_sentinel=True)
+    value, unit, error = _parse_unique(np.asarray(uniques, dtype=object))
+
+    # Broadcast back to rows; code -1 marks missing input
+    missing = codes < 0
+    codes = np.where(missing, 0, codes)
+    value = np.where(missing, np.nan, value[codes] if len(uniques) else np.nan)
+    unit = np.where(missing, -1, unit[codes] if len(uniques) else -1)
+    error = np.where(missing, MISSING, error[codes] if len(uniques) else MISSING)
+    value = np.where(error == OK, value, np.nan)
+
+    return pd.DataFrame({
+        "value": value,
+        "unit": pd.Categorical.from_codes(unit, categories=UNITS),
+        "error": error.astype(np.int8),
+    }, index=values.index)
+
+
+def parse_speed(values):
+    """Split "mph (kmph)" strings into float mph and kmph columns."""
+    values = pd.Series(values)
+    parts = values.astype("string").str.extract(SPEED_RE)
+    return pd.DataFrame({"mph": _number(parts["mph"]), "kmph": _number(parts["kmph"])},
+                        index=values.index)
+
+
+def time_to_seconds(t):
+    """Seconds for a single h:mm:ss.ff / m:ss.ff / ss.ff string, else None."""
+    row = normalize_performance([t]).iloc[0]
+    return float(row["value"]) if row["unit"] == "s" else None
@@ -0,0 +1,38 @@
+""" plotting.py                                           yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Shared plotting helpers. matplotlib is only imported the first time a
+    figure is drawn.
+
+  Every figure is a bare Figure on its own Agg canvas, never registered with
+    pyplot: figure() hands one out, saves it to its path and clears it on the
+    way out, so nothing is left behind between figures and several can be
+    drawn at once in separate processes (see run() in stages.py).
+"""
+
+from contextlib import contextmanager
+
+from .instrument import span
+
+
+@contextmanager
+def figure(path, **kwargs):
+    """A new Figure(**kwargs), saved to path when the block ends, then released."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(**kwargs)
+    FigureCanvasAgg(fig)
+    try:
+        yield fig
+        with span("savefig", "render"):
+            fig.savefig(path)
+    finally:
+        fig.clear()
+
+
+# Custom formatter to convert seconds to mm:ss.ss
+def seconds_to_time_format(x, pos):
+    minutes = int(x // 60)
+    seconds = x % 60
+    return f"{minutes}:{seconds:05.2f}"
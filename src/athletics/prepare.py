@@ -0,0 +1,131 @@
+""" prepare.py                                            yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Section (2): read in the CSV files and prepare them for analysis.
+
+  load_records() and load_keely() return the frames every later stage starts
+    from. They come from the Feather cache in frames.py when the CSVs are
+    unchanged and are memoised for the life of the process, so stages must
+    treat them as read-only and copy before adding columns.
+"""
+
+from functools import lru_cache
+
+import pandas as pd
+
+from .athletes import default_athletes
+from .countries import default_countries
+from .events import default_taxonomy
+from .frames import cached_frames
+from .ingest import read_log
+from .instrument import span
+from .paths import DAT, KEELY_DATA, PREPARE_CODE, PROGRESSION_DATA, RECORDS_DATA
+from .performance import normalize_performance, parse_speed
+from .progression import RecordStore
+from .schema import CSV_DTYPES, compact, concat, replace
+
+#------------------------------------------------------------------------------
+#--- World records
+#------------------------------------------------------------------------------
+
+def prepare_records(df_records, countries, athletes, gender):
+    """Add continent, event group, numeric mark, date, year and age columns."""
+    # COUNTRY AND CONTINENTS SECTION
+    # Initially I was going to do some analysis on Nationalities and Continents of Record Breaking Athletes, but couldn't find any interesting plots or analysis from this
+    # and was already on a tight word count/plot count, hence the columns added in this section do not go any further.
+
+    # Add ISO code, full country name and continent (IOC and historic codes via data/country_aliases.csv):
+    df = pd.concat([df_records.reset_index(drop=True),
+                    countries.resolve(df_records['Nationality'].reset_index(drop=True))], axis=1)
+
+    # EVENTS SECTION
+
+    # Replace 'Marathon[e]' with 'Marathon' in the Event column for tidiness
+    df['Event'] = replace(df['Event'], {'Marathon[e]': 'Marathon'})
+    # Separate events into their types (categorical, one lookup per distinct event):
+    df['Group'] = default_taxonomy().classify(df['Event'])
+
+    # PERFORMANCE SECTION
+
+    # Marks as numbers (seconds, metres or points) and the speed column as mph/kmph:
+    perf = normalize_performance(df['Performance'])
+    df['Performance_value'] = perf['value']
+    df['Performance_unit'] = perf['unit']
+    df['Performance_error'] = perf['error']
+    speed = parse_speed(df['Avg. speed mph (kmph)'])
+    df['Speed_mph'] = speed['mph']
+    df['Speed_kmph'] = speed['kmph']
+
+    # AGE SECTION
+
+    # Convert record dates to datetime format:
+    df['Date'] = pd.to_datetime(df['Date'], format='%d %b %Y', errors='coerce')
+
+    # Look up DOBs (accent/spelling tolerant, see athletes.py) and create new age column:
+    df[f'{gender} DOB'] = athletes.dob(df['Athlete'], gender)
+    df['Age'] = (df['Date'] - df[f'{gender} DOB']).dt.days / 365.25
+
+    # Extract Year:
+    df['Year'] = df['Date'].dt.year
+    return compact(df)
+
+
+def _prepare(df_records, countries, athletes, gender):
+    with span("prepare_records", "prepare", rows=len(df_records)):
+        return prepare_records(df_records, countries, athletes, gender)
+
+
+def build_records():
+    """Build the prepared (df_men, df_women) world record frames from CSV."""
+    df_world_records_men = pd.read_csv(DAT + "world_records_men.csv", dtype=CSV_DTYPES)
+    df_world_records_women = pd.read_csv(DAT + "world_records_women.csv", dtype=CSV_DTYPES)
+    countries = default_countries()
+    athletes = default_athletes()
+
+    df_men = _prepare(df_world_records_men, countries, athletes, 'Male')
+    df_women = _prepare(df_world_records_women, countries, athletes, 'Female')
+    return df_men, df_women
+
+
+@lru_cache(maxsize=None)
+def load_records():
+    """Return the prepared (df_men, df_women) world record frames."""
+    return cached_frames(("records_men", "records_women"), RECORDS_DATA + PREPARE_CODE, build_records)
+
+
+def build_progression(path=PROGRESSION_DATA[0]):
+    """Earlier world records from the progression pages, with Gender, Event,
+    Group, the mark as a number, Date and Year like the record frames."""
+    df = pd.read_csv(path, dtype=CSV_DTYPES)
+    df['Event'] = replace(df['Event'], {'Marathon[e]': 'Marathon'})
+    df['Group'] = default_taxonomy().classify(df['Event'])
+    perf = normalize_performance(df['Performance'])
+    df['Performance_value'] = perf['value']
+    df['Performance_unit'] = perf['unit']
+    df['Date'] = pd.to_datetime(df['Date'], format='%d %b %Y', errors='coerce')
+    df['Year'] = df['Date'].dt.year
+    return compact(df)
+
+
+@lru_cache(maxsize=None)
+def load_progression():
+    """Return a RecordStore of the world records as (start, end) intervals:
+    the current records and the earlier ones they superseded."""
+    return RecordStore.from_frames(*load_records(), history=build_progression())
+
+#------------------------------------------------------------------------------
+#--- Keely Hodgkinson's performances
+#------------------------------------------------------------------------------
+
+def build_keely():
+    """Keely Hodgkinson's outdoor performances with times in seconds, from CSV."""
+    # Read through the streaming ingest path: indoor rows (and meetings/venues
+    # that only appear indoors) are dropped before dates and times are parsed:
+    keely = concat(read_log(DAT + "keely_data.csv", indoor=False))
+    return (keely,)
+
+
+@lru_cache(maxsize=None)
+def load_keely():
+    """Return Keely Hodgkinson's outdoor performances with times in seconds."""
+    return cached_frames(("keely",), KEELY_DATA + PREPARE_CODE, build_keely)[0]
@@ -0,0 +1,143 @@
+""" progression.py                                        yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Record progression store: who held each record, and when.
+
+  Every record is held as an interval [Start, End) per gender and event.
+    A record ends on the date a strictly better mark is set in the same
+    event (times lower, distances and points higher); equalling it does not
+    end it, so shared records stand side by side. End is NaT while a record
+    still stands.
+
+  Rows are sorted on (gender/event, start day) packed into one int64 key, so
+    at() answers "the record(s) standing in every event on date X" with one
+    binary search per event, and longest_reigns() / records_per_year()
+    aggregate over the intervals in single vectorised passes. The current
+    record lists give the standing records; the superseded ones come from
+    the progression tables (data/world_record_progression.csv, scraped with
+    python3 -m athletics.bulk --progression) and fill in the history.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .schema import compact, concat
+
+EPOCH = pd.Timestamp("1970-01-01")
+DAY = pd.Timedelta(days=1)
+SHIFT = 32
+BIAS = 1 << 31  # days are stored offset so they pack as unsigned
+OPEN = np.iinfo(np.int64).max
+
+
+def running_best(values, units, groups):
+    """Best mark so far within each group, for rows in date order.
+
+    A running minimum for times (unit "s"), a running maximum otherwise.
+    """
+    sign = np.where(np.asarray(units) == "s", 1.0, -1.0)
+    signed = pd.Series(np.asarray(values, dtype=float) * sign)
+    return signed.groupby(np.asarray(groups)).cummin().to_numpy() * sign
+
+
+class RecordStore:
+    """Records as [Start, End) intervals, sorted per gender and event."""
+
+    def __init__(self, records):
+        """records has a row per record: Gender, Event, Date, Performance_value
+        and Performance_unit, plus any other columns to hand back from queries."""
+        df = records.dropna(subset=["Date", "Performance_value"]).reset_index(drop=True)
+        codes, self.groups = pd.factorize(df["Gender"].astype(str) + "|" + df["Event"].astype(str), sort=True)
+        days = ((df["Date"] - EPOCH) // DAY).to_numpy(dtype=np.int64)
+
+        # Sort by event, then date; ties keep the order they were given in
+        order = np.lexsort((np.arange(len(df)), days, codes))
+        df = df.iloc[order].reset_index(drop=True)
+        self.order = order
+        self.codes = codes[order].astype(np.int64)
+        self.days = days[order]
+
+        # Signed so lower is always better; the running best then only falls
+        sign = np.where(df["Performance_unit"].astype(str) == "s", 1.0, -1.0)
+        signed = df["Performance_value"].to_numpy(dtype=float) * sign
+        best = pd.Series(signed).groupby(self.codes).cummin().to_numpy()
+
+        # End of each record: the first row of its event whose running best
+        # beats it. -best rises within an event, so dense-rank it and search
+        # (event, rank) keys for the first rank above the record's own mark.
+        levels = np.unique(-best)
+        best_keys = (self.codes << SHIFT) | np.searchsorted(levels, -best, side="right")
+        mark_keys = (self.codes << SHIFT) | np.searchsorted(levels, -signed, side="right")
+        beaten = np.searchsorted(best_keys, mark_keys, side="right")
+        ended = beaten < len(df)
+        beaten = np.where(ended, beaten, 0)
+        ended &= self.codes[beaten] == self.codes
+        self.end_days = np.where(ended, np.maximum(self.days[beaten], self.days), OPEN)
+
+        # First row of each run of equal running bests (a record and its equals)
+        run_start = np.ones(len(df), dtype=bool)
+        run_start[1:] = (self.codes[1:] != self.codes[:-1]) | (best[1:] != best[:-1])
+        self.first = np.maximum.accumulate(np.where(run_start, np.arange(len(df)), 0))
+
+        self.start_keys = (self.codes << SHIFT) | (self.days + BIAS)
+        end = pd.Series(pd.to_datetime(np.where(ended, self.end_days, 0), unit="D"))
+        self.records = df.assign(Start=df["Date"], End=end.where(ended))
+
+    @classmethod
+    def from_frames(cls, df_men, df_women, history=None):
+        """Store of the prepared (df_men, df_women) record frames.
+
+        history adds earlier records, with a Gender column (see
+        prepare.build_progression). A history row with the same mark as a
+        current record of its gender and event is that record, so the
+        current lists' row is kept instead.
+        """
+        records = concat([df_men.assign(Gender="Male"), df_women.assign(Gender="Female")], ignore_index=True)
+        if history is not None and len(history):
+            key = ["Gender", "Event", "Performance_value"]
+            current = pd.MultiIndex.from_frame(records[key].astype({"Gender": str, "Event": str}))
+            listed = pd.MultiIndex.from_frame(history[key].astype({"Gender": str, "Event": str})).isin(current)
+            records = concat([compact(records), history[~listed]], ignore_index=True)
+        return cls(records)
+
+    def _groups(self, gender):
+        groups = np.arange(len(self.groups), dtype=np.int64)
+        if gender is not None:
+            groups = groups[self.groups.str.startswith(gender + "|")]
+        return groups
+
+    def _in_order(self, rows):
+        # Hand rows back in the order the records were given
+        return self.records.iloc[rows[np.argsort(self.order[rows], kind="stable")]].reset_index(drop=True)
+
+    def at(self, date, gender=None):
+        """The record(s) standing in every event on date (optionally one gender's)."""
+        day = (pd.Timestamp(date) - EPOCH) // DAY
+        groups = self._groups(gender)
+
+        # Last record started by date in each event, then back to the first of its equals
+        last = np.searchsorted(self.start_keys, (groups << SHIFT) | (day + BIAS), side="right") - 1
+        valid = last >= 0
+        valid[valid] = self.codes[last[valid]] == groups[valid]
+        last = last[valid]
+        first = self.first[last]
+        counts = last - first + 1
+        rows = np.repeat(first, counts) + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        return self._in_order(rows[self.end_days[rows] > day])
+
+    def longest_reigns(self, as_of, n=None, gender=None):
+        """Records by how long they stood (or have stood so far) as of a date."""
+        as_of = pd.Timestamp(as_of)
+        df = self.records[self.records["Start"] <= as_of]
+        if gender is not None:
+            df = df[df["Gender"] == gender]
+        end = df["End"].where(df["End"] <= as_of, as_of)
+        df = df.assign(Reign=end - df["Start"], Years=(end - df["Start"]).dt.days / 365.25)
+        df = df.sort_values("Reign", ascending=False, kind="stable")
+        return (df if n is None else df.head(n)).reset_index(drop=True)
+
+    def records_per_year(self):
+        """Number of records set each year, a column per gender."""
+        counts = self.records.groupby([self.records["Start"].dt.year.rename("Year"), "Gender"],
+                                      observed=True).size()
+        return counts.unstack("Gender", fill_value=0)
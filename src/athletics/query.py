@@ -0,0 +1,208 @@
+""" query.py                                              yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Indexed lookups on the prepared frames (men's and women's records, the
+    performance log) instead of a boolean scan of the whole frame per
+    question.
+
+  A FrameIndex keeps, for each key column (event, group, athlete,
+    nationality, continent, meeting, plus any derived key such as the
+    meeting tier), the row positions sorted by value with the start of each
+    value's run, and for the Date column the positions sorted by date. So
+    "all records for the 800 m" is a slice, "her races between two dates"
+    a binary search, and a query on several keys materialises only the
+    smallest candidate set and filters that. Positions come back in frame
+    order, so rows() gives the same rows, in the same order and with the
+    same index labels, as the equivalent boolean mask.
+
+      python3 -m athletics.query --gender Female --group Sprints
+      python3 -m athletics.query --continent Europe --from 1980 --to 1989
+"""
+
+import argparse
+import sys
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+KEYS = ("Event", "Group", "Athlete", "Nationality", "Continent_Name", "Meeting")
+
+
+class KeyIndex:
+    """Row positions grouped by the value of one key."""
+
+    def __init__(self, values):
+        values = pd.Series(values)
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+        else:
+            codes, uniques = pd.factorize(values)
+        self.codes = codes.astype(np.int32, copy=False)
+        self.values = pd.Index(uniques)
+        # Missing values (code -1) sort first, ahead of the first value's run
+        self.order = np.argsort(self.codes, kind="stable")
+        counts = np.bincount(self.codes[self.codes >= 0], minlength=len(self.values))
+        self.starts = np.concatenate([[0], np.cumsum(counts)]) + np.count_nonzero(self.codes < 0)
+
+    def lookup(self, values):
+        """Codes of the given value(s) that occur in the index."""
+        values = [values] if isinstance(values, str) or np.ndim(values) == 0 else list(values)
+        codes = self.values.get_indexer(values)
+        return np.unique(codes[codes >= 0])
+
+    def size(self, codes):
+        return int((self.starts[codes + 1] - self.starts[codes]).sum())
+
+    def positions(self, codes):
+        parts = [self.order[self.starts[code]:self.starts[code + 1]] for code in codes]
+        if len(parts) == 1:
+            return parts[0]
+        return np.sort(np.concatenate(parts)) if parts else np.empty(0, dtype=np.intp)
+
+    def test(self, positions, codes):
+        return np.isin(self.codes[positions], codes)
+
+
+class DateIndex:
+    """Row positions sorted by date (rows without one are left out)."""
+
+    def __init__(self, dates):
+        self.dates = pd.to_datetime(pd.Series(dates)).to_numpy(dtype="datetime64[ns]").view(np.int64)
+        known = np.flatnonzero(self.dates != np.iinfo(np.int64).min)
+        self.order = known[np.argsort(self.dates[known], kind="stable")]
+        self.sorted = self.dates[self.order]
+
+    @staticmethod
+    def bounds(date_from, date_to):
+        """Inclusive bounds in ns; a bare year or year-month date_to ("1989",
+        1989, "1989-06") runs to the end of that year or month."""
+        lo = np.iinfo(np.int64).min + 1 if date_from is None else pd.Timestamp(str(date_from)).value
+        if date_to is None:
+            hi = np.iinfo(np.int64).max
+        elif isinstance(date_to, (str, int)) and len(str(date_to)) <= 10:
+            hi = pd.Period(str(date_to)).end_time.value
+        else:
+            hi = pd.Timestamp(date_to).value
+        return lo, hi
+
+    def span(self, lo, hi):
+        return np.searchsorted(self.sorted, lo, "left"), np.searchsorted(self.sorted, hi, "right")
+
+    def positions(self, lo, hi):
+        start, stop = self.span(lo, hi)
+        return np.sort(self.order[start:stop])
+
+    def test(self, positions, lo, hi):
+        dates = self.dates[positions]
+        return (dates >= lo) & (dates <= hi)
+
+
+class FrameIndex:
+    """Secondary indexes over the rows of df.
+
+    keys are the columns to index (those df does not have are skipped),
+    extra maps further key names to values aligned with df's rows, and
+    dates is the date column for range queries.
+    """
+
+    def __init__(self, df, keys=KEYS, dates="Date", extra=None):
+        self.df = df
+        self.keys = {key: KeyIndex(df[key]) for key in keys if key in df.columns}
+        for key, values in (extra or {}).items():
+            self.keys[key] = KeyIndex(values)
+        self.dates = DateIndex(df[dates]) if dates in df.columns else None
+
+    def __len__(self):
+        return len(self.df)
+
+    def values(self, key):
+        """Distinct values of key, in index order."""
+        return list(self.keys[key].values)
+
+    def positions(self, date_from=None, date_to=None, **keys):
+        """Sorted row positions matching every criterion.
+
+        Each keyword names a key and gives one value or a list of them (any
+        matches); date_from/date_to bound the date, inclusive, and need an
+        index built with a date column.
+        """
+        # (candidates, how to get them, how to filter someone else's)
+        criteria = []
+        for key, values in keys.items():
+            index, codes = self.keys[key], self.keys[key].lookup(values)
+            criteria.append((index.size(codes), lambda index=index, codes=codes: index.positions(codes),
+                             lambda pos, index=index, codes=codes: index.test(pos, codes)))
+        if date_from is not None or date_to is not None:
+            if self.dates is None:
+                raise ValueError("date_from/date_to given, but this index was built without a date column")
+            lo, hi = self.dates.bounds(date_from, date_to)
+            start, stop = self.dates.span(lo, hi)
+            criteria.append((stop - start, lambda: self.dates.positions(lo, hi),
+                             lambda pos: self.dates.test(pos, lo, hi)))
+        if not criteria:
+            return np.arange(len(self.df))
+
+        # Start from the most selective index, then filter only those rows
+        criteria.sort(key=lambda criterion: criterion[0])
+        positions = criteria[0][1]()
+        for _, _, test in criteria[1:]:
+            if not len(positions):
+                break
+            positions = positions[test(positions)]
+        return positions
+
+    def count(self, date_from=None, date_to=None, **keys):
+        return len(self.positions(date_from, date_to, **keys))
+
+    def rows(self, date_from=None, date_to=None, **keys):
+        """The matching rows of df, in frame order."""
+        return self.df.take(self.positions(date_from, date_to, **keys))
+
+
+#------------------------------------------------------------------------------
+#--- Indexes over the prepared frames, built once per process
+#------------------------------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def records_index():
+    """FrameIndex of the men's and women's records."""
+    from .prepare import load_records
+    df_men, df_women = load_records()
+    return FrameIndex(df_men), FrameIndex(df_women)
+
+
+@lru_cache(maxsize=None)
+def keely_index():
+    """FrameIndex of the Keely Hodgkinson log, with meeting tiers as a key."""
+    from .keely import log_index
+    from .prepare import load_keely
+    return log_index(load_keely())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Look up world records through the indexes.")
+    parser.add_argument("--gender", choices=["Male", "Female"], nargs="*", default=["Male", "Female"])
+    parser.add_argument("--event", nargs="*")
+    parser.add_argument("--group", nargs="*")
+    parser.add_argument("--athlete", nargs="*")
+    parser.add_argument("--nationality", nargs="*")
+    parser.add_argument("--continent", nargs="*")
+    parser.add_argument("--from", dest="date_from", help="first date (inclusive)")
+    parser.add_argument("--to", dest="date_to", help="last date (inclusive)")
+    args = parser.parse_args(argv)
+
+    keys = {key: values for key, values in [("Event", args.event), ("Group", args.group),
+                                            ("Athlete", args.athlete), ("Nationality", args.nationality),
+                                            ("Continent_Name", args.continent)] if values}
+    for gender, index in zip(["Male", "Female"], records_index()):
+        if gender in args.gender:
+            rows = index.rows(args.date_from, args.date_to, **keys)
+            print(f"{gender}: {len(rows)} record(s)")
+            if len(rows):
+                print(rows[["Event", "Performance", "Athlete", "Nationality", "Date"]].to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
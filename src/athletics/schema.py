@@ -0,0 +1,78 @@
+""" schema.py                                             yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Compact dtypes for the heavily repeated string columns.
+
+  Athletes, countries, meetings, venues and events repeat many times over in
+    full result lists, so they are held as categoricals: one copy of each
+    distinct string plus a small integer code per row. Columns are read from
+    CSV straight into that form (CSV_DTYPES), kept that way through merges
+    and replacements, and concat() unions categories so stacking frames does
+    not fall back to plain Python strings.
+
+  memory_report() shows, per frame and column, how many bytes are used
+    against the number of rows and distinct values.
+"""
+
+import numpy as np
+import pandas as pd
+
+# String columns stored as categoricals wherever they appear:
+CATEGORICAL = ["Event", "Athlete", "Nationality", "Meeting", "Location", "Country",
+               "Group", "Three_Letter_Country_Code", "Country_Name", "Continent_Name",
+               "Venue", "Gender"]
+
+# dtype= for pd.read_csv, so the columns never exist as object strings:
+CSV_DTYPES = {col: "category" for col in CATEGORICAL}
+
+
+def compact(df):
+    """Return df with every CATEGORICAL column it has stored as a categorical."""
+    cols = [col for col in CATEGORICAL
+            if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype)]
+    return df.astype({col: "category" for col in cols}) if cols else df
+
+
+def replace(series, mapping):
+    """Series.replace(mapping) that works on the categories of a categorical."""
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.replace(mapping)
+    # Replaced categories may collide with existing ones, so re-factorise them
+    new_codes, categories = pd.factorize(series.cat.categories.to_series().replace(mapping))
+    codes = series.cat.codes.to_numpy()
+    codes = np.where(codes < 0, -1, new_codes[codes])
+    return pd.Series(pd.Categorical.from_codes(codes, categories=categories),
+                     index=series.index, name=series.name)
+
+
+def concat(frames, empty=None, **kwargs):
+    """pd.concat that keeps categorical columns categorical.
+
+    pd.concat only keeps a categorical if every frame has identical categories;
+    otherwise it falls back to object. Categories are unioned first. With no
+    frames at all, empty is returned (a frame with no columns by default)
+    rather than pd.concat's error.
+    """
+    frames = list(frames)
+    if not frames:
+        return pd.DataFrame() if empty is None else empty
+    for col in CATEGORICAL:
+        if not all(col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype) for df in frames):
+            continue
+        categories = pd.api.types.union_categoricals([df[col] for df in frames]).categories
+        frames = [df.assign(**{col: df[col].cat.set_categories(categories)}) for df in frames]
+    return pd.concat(frames, **kwargs)
+
+
+def memory_report(frames):
+    """Bytes per column for a dict of name -> DataFrame, with frame totals."""
+    rows = []
+    for name, df in frames.items():
+        usage = df.memory_usage(deep=True, index=False)
+        for col in df.columns:
+            rows.append({"Frame": name, "Column": col, "Dtype": str(df[col].dtype),
+                         "Rows": len(df), "Unique": df[col].nunique(dropna=True),
+                         "Bytes": int(usage[col])})
+        rows.append({"Frame": name, "Column": "(total)", "Dtype": "", "Rows": len(df),
+                     "Unique": np.nan, "Bytes": int(usage.sum())})
+    return pd.DataFrame(rows).set_index(["Frame", "Column"])
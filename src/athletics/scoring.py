@@ -0,0 +1,134 @@
+""" scoring.py                                            yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  World Athletics scoring tables: points for any mark in any event.
+
+  The tables are quadratics in the mark, one per gender and event:
+      points = floor(a * (x + b)**2 + c)
+    with x the mark in seconds, metres or points. Only the branch where a
+    better mark scores more is used (x below -b for times, above it for
+    distances and points); marks past the vertex, and totals under zero,
+    score 0. The coefficients are read from data/scoring_tables.csv
+    (gender,event,unit,a,b,c), with events named as in the record lists.
+
+  The file ships with only its header: the coefficients have to be copied
+    in from the official World Athletics scoring tables. Until they are,
+    scoring raises a ValueError saying so rather than returning made-up
+    points.
+
+  ScoringTable.points() pairs each mark with its (gender, event) row by
+    factorising the pairs and looking each distinct one up once, then
+    scores every mark in one array expression, so ranking millions of
+    season results across events costs a few passes over the arrays.
+    check() compares the computed points with the Pts column of the
+    record lists.
+
+      python3 -m athletics.scoring          # check against the records' Pts
+"""
+
+import sys
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .paths import DAT
+
+TABLES = DAT + "scoring_tables.csv"
+COLUMNS = ["gender", "event", "unit", "a", "b", "c"]
+
+
+class ScoringTable:
+    """(gender, event) -> scoring coefficients."""
+
+    def __init__(self, coefficients):
+        table = pd.DataFrame(coefficients, columns=COLUMNS).reset_index(drop=True)
+        keys = table["gender"].astype(str) + "|" + table["event"].astype(str)
+        if keys.duplicated().any():
+            raise ValueError(f"Scoring coefficients given twice for: {', '.join(keys[keys.duplicated()])}")
+        self.table = table
+        self.keys = pd.Index(keys)
+        self.a, self.b, self.c = (table[col].to_numpy(dtype=float) for col in ("a", "b", "c"))
+        self.timed = (table["unit"] == "s").to_numpy()
+
+    @classmethod
+    def from_csv(cls, path=TABLES):
+        return cls(pd.read_csv(path))
+
+    def rows(self, events, genders):
+        """Coefficient row for each (gender, event) pair (-1 where there is none)."""
+        event_codes, event_names = pd.factorize(pd.Series(events), use_na_sentinel=True)
+        if np.ndim(genders) == 0:
+            gender_codes, gender_names = np.zeros(len(event_codes), dtype=np.int64), [genders]
+        else:
+            gender_codes, gender_names = pd.factorize(pd.Series(genders), use_na_sentinel=True)
+
+        # Look up every distinct (gender, event) pair once, then index by pair code
+        pairs = pd.MultiIndex.from_product([gender_names, event_names])
+        found = self.keys.get_indexer([f"{gender}|{event}" for gender, event in pairs])
+        found = np.append(found, -1)  # the slot that missing genders/events point at
+        missing = (gender_codes < 0) | (event_codes < 0)
+        return found[np.where(missing, -1, gender_codes * len(event_names) + event_codes)]
+
+    def points(self, values, events, genders):
+        """Points for each mark, NaN where the event has no coefficients.
+
+        genders is one label ("Male"/"Female") or one per mark.
+        """
+        if not len(self.table):
+            raise ValueError(f"The scoring table has no coefficients ({TABLES} ships with only its header): "
+                             "copy the gender,event,unit,a,b,c rows in from the World Athletics scoring tables")
+        values = np.asarray(values, dtype=float)
+        rows = self.rows(events, genders)
+        scored = rows >= 0
+        rows = np.where(scored, rows, 0)
+
+        a, b, c = self.a[rows], self.b[rows], self.c[rows]
+        scoring_side = np.where(self.timed[rows], values < -b, values > -b)
+        points = np.floor(a * (values + b) ** 2 + c)
+        points = np.where(scoring_side, np.maximum(points, 0), 0)
+        return np.where(scored & np.isfinite(values), points, np.nan)
+
+    def score(self, df, gender=None):
+        """Points for a prepared frame's marks (Performance_value, Event and
+        Gender, or one gender for the whole frame), on its index."""
+        genders = df["Gender"] if gender is None else gender
+        return pd.Series(self.points(df["Performance_value"], df["Event"], genders),
+                         index=df.index, name="Points")
+
+    def check(self, df, gender=None):
+        """Rows of df with a scraped Pts, next to the computed Points."""
+        checked = df.loc[df["Pts"].notna(), ["Event", "Performance", "Pts"]].copy()
+        checked["Points"] = self.score(df, gender)[checked.index]
+        checked["Diff"] = checked["Points"] - checked["Pts"]
+        return checked
+
+
+@lru_cache(maxsize=None)
+def default_scoring():
+    return ScoringTable.from_csv()
+
+
+def main(argv=None):
+    """Compare computed points with the records' Pts; list events that differ."""
+    from .prepare import load_records
+
+    bad = 0
+    for gender, df in zip(("Male", "Female"), load_records()):
+        try:
+            checked = default_scoring().check(df, gender)
+        except ValueError as error:
+            print(error, file=sys.stderr)
+            return 1
+        missing = checked["Points"].isna()
+        wrong = ~missing & (checked["Diff"] != 0)
+        bad += int(missing.sum() + wrong.sum())
+        print(f"{gender}: {int((~missing & ~wrong).sum())} of {len(checked)} Pts reproduced, "
+              f"{int(wrong.sum())} differ, {int(missing.sum())} with no coefficients")
+        if wrong.any():
+            print(checked[wrong].to_string())
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
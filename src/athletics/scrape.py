@@ -0,0 +1,354 @@
+""" scrape.py                                             yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Section (1): webscrape the world records tables and save them to CSV.
+
+  Wikipedia contributors. "List of world records in athletics." Wikipedia.
+    https://en.wikipedia.org/wiki/List_of_world_records_in_athletics.
+
+  Every fetched page is kept in the snapshot store (snapshots.py). If the
+    page is byte-for-byte the same as the one last parsed, parsing is skipped;
+    if the network is unavailable the latest snapshot is used instead.
+
+  There are two parsers producing identical frames:
+    - get_table() walks a BeautifulSoup tree (the original approach), and
+    - parse_records() streams the raw HTML through an event-driven parser
+      (lxml if installed, html.parser if not) in a single pass, which is
+      what scrape() uses.
+    Both hand their rows to the same records_frame(), so flag and rowspan
+    handling cannot drift apart.
+"""
+
+import os
+import re
+from html.parser import HTMLParser
+
+import pandas as pd
+
+from .instrument import span
+from .paths import DAT
+
+# I did a placement year working in statistical programming for clinical trials, and working with patient data. To create datasets we often used lots of flags,
+# hence the flagging method used below, which is dissimilar to anything we looked at in class, hence I wanted to provide some reasoning to my potentially
+# strange approach.
+
+SITE = "https://en.wikipedia.org/wiki/List_of_world_records_in_athletics"
+OUTPUTS = [DAT + "world_records_men.csv", DAT + "world_records_women.csv"]
+
+# Rows (or cells) with these backgrounds are flagged and removed:
+FLAG_COLOURS = ["pink", "#cef6f5"]
+
+# Scripts carry per-request noise (request ids, timings) and are never part of
+# a table, so they are dropped before a page is hashed and stored:
+SCRIPT_RE = re.compile(rb"<script\b.*?</script\s*>", re.IGNORECASE | re.DOTALL)
+
+
+def is_flagged(attrs):
+    """Check an element's attributes for one of the background flags."""
+    style = (attrs.get("style") or "").lower()
+    bgcolor = (attrs.get("bgcolor") or "").lower()
+    return "background:pink" in style or bgcolor in FLAG_COLOURS
+
+
+def records_frame(headers, rows):
+    """Build the records DataFrame from a table's header texts and body rows.
+
+    rows holds one (is_flagged, cells) pair per <tr> after the two header rows,
+    with cells a list of (text, rowspan) where rowspan is None if absent.
+    """
+    data = []
+    current_event = None
+    rowspan_count = 0
+    headers = ["Event"] + list(headers)  # Insert Event as first column header
+
+    for flagged, cells in rows:
+        row = []
+        if cells[0][1] is not None:
+            current_event = cells[0][0]
+            rowspan_count = int(cells[0][1]) - 1
+            row.append(current_event)
+            cells = cells[1:]
+        elif rowspan_count > 0:
+            row.append(current_event)
+            rowspan_count -= 1
+        else:
+            current_event = cells[0][0]
+            row.append(current_event)
+            cells = cells[1:]
+
+        # Append rest of the cells' text:
+        for text, _ in cells:
+            row.append(text)
+
+        # Add flag status at the end:
+        row.append(flagged)
+        data.append(row)
+
+    # Create DataFrame and assign column names
+    df = pd.DataFrame(data)
+    if len(df.columns) > len(headers) + 1:
+        for i in range(len(headers), len(df.columns) - 1):
+            headers.append(f"Column_{i}")
+    column_names = headers + ["Flagged"]
+    df.columns = column_names[:len(df.columns)]
+
+    # Remove flagged rows and drop flag column:
+    df = df[df["Flagged"] == False].reset_index(drop=True)
+    df = df.drop("Flagged", axis=1)
+
+    # Only keep relevant columns;
+    my_cols = list(set(range(0, 12)) - {3})
+    df = df.iloc[:, my_cols]
+    df.columns = ["Event", "Performance", "Wind", "Avg. speed mph (kmph)",
+                      "Pts", "Athlete", "Nationality", "Date", "Meeting",
+                      "Location", "Country"]
+
+    return df
+
+#------------------------------------------------------------------------------
+#--- BeautifulSoup parser
+#------------------------------------------------------------------------------
+
+def fetch_tables(site=SITE):
+    """Download the page and return its wikitable elements."""
+    from urllib import request
+    from bs4 import BeautifulSoup
+
+    response = BeautifulSoup(request.urlopen(site), "html.parser")
+    return response.find_all("table", class_="wikitable")
+
+
+def get_table(table):
+    """Turn one records wikitable into a DataFrame, dropping flagged rows."""
+    trs = table.find_all("tr")
+
+    # Get the header row:
+    headers = [th.get_text(strip=True) for th in trs[1].find_all("th")]
+
+    # Process each table row, skippimg headers:
+    rows = []
+    for tr in trs[2:]:
+        cells = tr.find_all(["td", "th"])
+        if not cells:
+            continue
+
+        # Check for background flags in the row:
+        flagged = is_flagged(tr) or any(is_flagged(td) for td in cells)
+        rows.append((flagged, [(cell.get_text(strip=True), cell.get("rowspan")) for cell in cells]))
+
+    return records_frame(headers, rows)
+
+#------------------------------------------------------------------------------
+#--- Streaming parser
+#------------------------------------------------------------------------------
+
+class WikitableTarget:
+    """Collects every wikitable's rows from a stream of parser events.
+
+    Uses lxml's parser-target interface (start/end/data/comment/close), and
+    matches BeautifulSoup's find_all semantics: a row belongs to every open
+    wikitable and a cell to every open row, text is joined from stripped
+    strings, and script/style contents and comments are ignored.
+
+    Each row is [flagged, cells] and each cell [tag, strings, rowspan, href]
+    where href is the cell's first link.
+    """
+
+    CONTAINERS = ("table", "tr", "td", "th")
+
+    def __init__(self):
+        self.tables = []        # one list of rows per wikitable, in order
+        self.closed = 0         # how many wikitables have been closed
+        self._stack = []        # open table/tr/td/th elements as (tag, obj)
+        self._open = dict.fromkeys(self.CONTAINERS, 0)
+        self._tables = []
+        self._rows = []
+        self._cells = []
+        self._text = []         # text since the last tag, possibly split across events
+        self._skip = False
+
+    def _flush(self):
+        # BeautifulSoup strips each string between two tags separately
+        if self._text:
+            data = "".join(self._text).strip()
+            self._text = []
+            if data:
+                for cell in self._cells:
+                    cell[1].append(data)
+
+    def start(self, tag, attrs):
+        self._flush()
+        if tag in ("script", "style"):
+            self._skip = True
+            return
+        if tag == "a" and self._cells and self._cells[-1][3] is None:
+            # Remember each cell's first link (used for athlete pages)
+            self._cells[-1][3] = attrs.get("href")
+        if tag not in self.CONTAINERS:
+            return
+        self._open[tag] += 1
+        if tag == "table":
+            rows = [] if "wikitable" in (attrs.get("class") or "").split() else None
+            if rows is not None:
+                self.tables.append(rows)
+                self._tables.append(rows)
+            self._stack.append((tag, rows))
+        elif tag == "tr":
+            row = [is_flagged(attrs), []]
+            for rows in self._tables:
+                rows.append(row)
+            self._rows.append(row)
+            self._stack.append((tag, row))
+        else:
+            cell = [tag, [], attrs.get("rowspan"), None]
+            flagged = is_flagged(attrs)
+            for row in self._rows:
+                row[1].append(cell)
+                row[0] = row[0] or flagged
+            self._cells.append(cell)
+            self._stack.append((tag, cell))
+
+    def end(self, tag):
+        self._flush()
+        if tag in ("script", "style"):
+            self._skip = False
+            return
+        if not self._open.get(tag):
+            return
+        # Close everything up to the most recent matching element:
+        while True:
+            t, obj = self._stack.pop()
+            self._open[t] -= 1
+            if t == "table":
+                if obj is not None:
+                    self._tables.pop()
+                    self.closed += 1
+            elif t == "tr":
+                self._rows.pop()
+            else:
+                self._cells.pop()
+            if t == tag:
+                break
+
+    def data(self, data):
+        if not self._skip and self._cells:
+            self._text.append(data)
+
+    def comment(self, text):
+        self._flush()
+
+    def close(self):
+        self._flush()
+        return self
+
+    def frame(self, i):
+        """records_frame() for the i-th wikitable."""
+        trs = self.tables[i]
+        headers = ["".join(text) for name, text, _, _ in trs[1][1] if name == "th"]
+        rows = [(flagged, [("".join(text), rowspan) for _, text, rowspan, _ in cells])
+                for flagged, cells in trs[2:] if cells]
+        return records_frame(headers, rows)
+
+
+class _StdlibParser(HTMLParser):
+    # Feeds html.parser events into a WikitableTarget when lxml is missing
+
+    def __init__(self, target):
+        super().__init__(convert_charrefs=True)
+        self.target = target
+
+    def handle_starttag(self, tag, attrs):
+        self.target.start(tag, {name: value or "" for name, value in attrs})
+
+    def handle_endtag(self, tag):
+        self.target.end(tag)
+
+    def handle_data(self, data):
+        self.target.data(data)
+
+    def handle_comment(self, data):
+        self.target.comment(data)
+
+    def close(self):
+        super().close()
+        return self.target.close()
+
+
+def _event_parser(target):
+    try:
+        from lxml import etree
+    except ImportError:
+        return _StdlibParser(target)
+    return etree.HTMLParser(target=target, encoding="utf-8")
+
+
+def read_wikitables(html, stop_after=None, chunk_size=1 << 16):
+    """Stream page HTML (str or bytes) through a WikitableTarget.
+
+    Uses lxml's event parser when it is installed and html.parser otherwise.
+    The page is fed in chunks, and with stop_after set parsing stops as soon
+    as that many wikitables have been closed.
+    """
+    target = WikitableTarget()
+    parser = _event_parser(target)
+    if isinstance(parser, HTMLParser) and isinstance(html, bytes):
+        html = html.decode("utf-8")
+    elif not isinstance(parser, HTMLParser) and isinstance(html, str):
+        html = html.encode("utf-8")
+    for start in range(0, len(html), chunk_size):
+        parser.feed(html[start:start + chunk_size])
+        if stop_after is not None and target.closed >= stop_after:
+            break
+    parser.close()
+    return target
+
+
+def parse_records(html, chunk_size=1 << 16):
+    """Parse the men's and women's records tables from raw page HTML.
+
+    Only the page up to the end of the first two wikitables is ever scanned.
+    """
+    target = read_wikitables(html, stop_after=2, chunk_size=chunk_size)
+    return target.frame(0), target.frame(1)
+
+#------------------------------------------------------------------------------
+#--- Fetch, snapshot and save
+#------------------------------------------------------------------------------
+
+def fetch_page(site=SITE):
+    from urllib import request
+
+    with request.urlopen(site) as response:
+        return SCRIPT_RE.sub(b"", response.read())
+
+
+def scrape(site=SITE, store=None):
+    """Scrape men's and women's tables and write them into the data folder.
+
+    Returns the two frames, or None if the page matched the snapshot that was
+    last parsed and the CSVs were left as they are.
+    """
+    from .snapshots import SnapshotStore
+
+    store = SnapshotStore() if store is None else store
+    try:
+        with span("fetch", "io"):
+            page = fetch_page(site)
+    except OSError as e:  # URLError, timeouts, connection resets
+        digest = store.latest(site)
+        if digest is None:
+            raise
+        print(f"Could not fetch {site} ({getattr(e, 'reason', e)}), using snapshot {digest[:12]}")
+    else:
+        digest = store.put(site, page)
+
+    if digest == store.parsed(site) and all(os.path.exists(path) for path in OUTPUTS):
+        return None
+
+    with span("parse", "parse") as parsed:
+        df_men, df_women = parse_records(store.get(digest))
+        parsed.rows = len(df_men) + len(df_women)
+    df_men.to_csv(OUTPUTS[0], index=False)
+    df_women.to_csv(OUTPUTS[1], index=False)
+    store.mark_parsed(site, digest)
+    return df_men, df_women
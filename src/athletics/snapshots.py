@@ -0,0 +1,69 @@
+""" snapshots.py                                          yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Local store of fetched HTML pages, keyed by the SHA-256 of their content.
+
+  Pages are saved as data/snapshots/<digest>.html. A small index.json keeps,
+    for every URL, the digest of the most recent fetch and the digest that
+    was last parsed into CSV, so that:
+      - an unchanged page can skip parsing altogether, and
+      - the pipeline can be run with no network from the latest snapshot.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+from .paths import DAT
+
+SNAPSHOTS = DAT + "snapshots/"
+
+
+class SnapshotStore:
+    """Content-addressed HTML snapshots plus a per-URL index."""
+
+    def __init__(self, root=SNAPSHOTS):
+        self.root = root.rstrip("/") + "/"
+        self.index_path = self.root + "index.json"
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+
+    def path(self, digest):
+        return self.root + digest + ".html"
+
+    def put(self, url, content):
+        """Save page bytes (if not already stored) and return their digest."""
+        digest = hashlib.sha256(content).hexdigest()
+        if not os.path.exists(self.path(digest)):
+            os.makedirs(self.root, exist_ok=True)
+            with open(self.path(digest), "wb") as f:
+                f.write(content)
+        entry = self.index.setdefault(url, {})
+        entry["latest"] = digest
+        entry["fetched"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self._save_index()
+        return digest
+
+    def get(self, digest):
+        with open(self.path(digest), "rb") as f:
+            return f.read()
+
+    def latest(self, url):
+        """Digest of the most recent snapshot of url, or None."""
+        return self.index.get(url, {}).get("latest")
+
+    def parsed(self, url):
+        """Digest of the snapshot of url that was last parsed, or None."""
+        return self.index.get(url, {}).get("parsed")
+
+    def mark_parsed(self, url, digest):
+        self.index.setdefault(url, {})["parsed"] = digest
+        self._save_index()
+
+    def _save_index(self):
+        os.makedirs(self.root, exist_ok=True)
+        with open(self.index_path, "w") as f:
+            json.dump(self.index, f, indent=1, sort_keys=True)
@@ -0,0 +1,242 @@
+""" stages.py                                             yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Registry of the pipeline stages, one per figure or table in results/.
+
+  Each stage only imports the section module it needs when it runs, so
+    rebuilding a single output does not pay for seaborn, statsmodels or bs4
+    unless that output actually uses them.
+
+  Stages also list the data files and source modules they read (`inputs`),
+    which is what the build cache in cache.py hashes to decide whether a
+    stage can be skipped. A stage with inputs=None is always run.
+
+  Apart from the scrape, which writes the data the others read, the stages
+    are independent, so run(jobs=N) builds the stale ones N at a time in a
+    process pool. Every figure is drawn on its own Figure and released once
+    saved (see plotting.py), so each worker holds at most one figure.
+"""
+
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .instrument import Profiler, span
+from .paths import AS_OF, DAT, FIG, KEELY_DATA, PKG, PREPARE_CODE, PROGRESSION_DATA, RECORDS_DATA, TAB
+
+Stage = namedtuple("Stage", ["name", "run", "outputs", "inputs", "params"], defaults=((),))
+
+
+CALENDAR = (DAT + "championships.csv",)
+
+
+def _src(*modules):
+    return PREPARE_CODE + tuple(PKG + module + ".py" for module in ("stages", "schema") + modules)
+
+
+def scrape():
+    from .scrape import scrape
+    scrape()
+
+
+def olympic_years():
+    from .olympics import olympic_year_counts, plot_olympic_years
+    from .prepare import load_progression
+    store = load_progression()
+    plot_olympic_years(olympic_year_counts(store.at(AS_OF, "Male"), store.at(AS_OF, "Female")))
+
+
+def olympic_test():
+    from .olympics import olympic_effect, write_olympic_test
+    from .prepare import load_progression
+    store = load_progression()
+    write_olympic_test(olympic_effect(store.at(AS_OF, "Male"), store.at(AS_OF, "Female")))
+
+
+def gender_gap():
+    from .gender_gap import gender_gap, plot_gender_gap
+    from .prepare import load_records
+    plot_gender_gap(gender_gap(*load_records()))
+
+
+def gender_gap_history():
+    from .gender_gap import gap_dist, gap_time, plot_gap_history, record_gaps
+    from .prepare import load_progression
+    plot_gap_history(record_gaps(load_progression(), gap_time + gap_dist), as_of=AS_OF)
+
+
+def ages_dist():
+    from .ages import plot_ages_dist
+    from .prepare import load_records
+    plot_ages_dist(*load_records())
+
+
+def avg_ages():
+    from .ages import avg_ages, write_avg_ages
+    from .prepare import load_records
+    write_avg_ages(avg_ages(*load_records()))
+
+
+def ages_box():
+    from .ages import plot_ages_box
+    from .prepare import load_records
+    plot_ages_box(*load_records())
+
+
+def longest_records():
+    from .longest import plot_longest_records
+    from .prepare import load_progression
+    plot_longest_records(load_progression(), as_of=AS_OF)
+
+
+def keely_all():
+    from .keely import plot_keely_all
+    from .query import keely_index
+    index = keely_index()
+    plot_keely_all(index.df, index=index)
+
+
+def keely_summary():
+    from .keely import diamond_league, fit_trend, write_keely_summary
+    from .query import keely_index
+    index = keely_index()
+    write_keely_summary(fit_trend(diamond_league(index.df, index)))
+
+
+def keely_trends():
+    from .keely import keely_trends
+    from .query import keely_index
+    from .trends import write_trends
+    index = keely_index()
+    write_trends(keely_trends(index.df, index))
+
+
+def keely_bests():
+    from .keely import keely_bests, write_keely_bests
+    from .prepare import load_keely
+    write_keely_bests(*keely_bests(load_keely()))
+
+
+def keely_DL():
+    from .keely import diamond_league, fit_trend, plot_keely_DL
+    from .query import keely_index
+    index = keely_index()
+    keely_DL = diamond_league(index.df, index)
+    plot_keely_DL(keely_DL, fit_trend(keely_DL))
+
+
+# In the same order as the sections of the original script:
+STAGES = {stage.name: stage for stage in [
+    Stage("scrape", scrape, (DAT + "world_records_men.csv", DAT + "world_records_women.csv"), None),
+    Stage("olympic_years", olympic_years, (FIG + "olympic_years.png",),
+          RECORDS_DATA + PROGRESSION_DATA + CALENDAR + _src("olympics", "championships", "progression", "plotting"),
+          ("as_of=" + AS_OF,)),
+    Stage("olympic_test", olympic_test, (TAB + "olympic_test.html",),
+          RECORDS_DATA + PROGRESSION_DATA + CALENDAR + _src("olympics", "championships", "progression"),
+          ("as_of=" + AS_OF,)),
+    Stage("gender_gap", gender_gap, (FIG + "gender_gap.png",),
+          RECORDS_DATA + _src("gender_gap", "progression", "plotting")),
+    Stage("gender_gap_history", gender_gap_history, (FIG + "gender_gap_history.png",),
+          RECORDS_DATA + PROGRESSION_DATA + _src("gender_gap", "progression", "plotting"), ("as_of=" + AS_OF,)),
+    Stage("ages_dist", ages_dist, (FIG + "ages_dist.png",),
+          RECORDS_DATA + _src("ages", "stats", "plotting")),
+    Stage("avg_ages", avg_ages, (TAB + "avg_ages.html",),
+          RECORDS_DATA + _src("ages", "stats")),
+    Stage("ages_box", ages_box, (FIG + "ages_box.png",),
+          RECORDS_DATA + _src("ages", "stats", "plotting")),
+    Stage("longest_records", longest_records, (FIG + "longest_records.png",),
+          RECORDS_DATA + PROGRESSION_DATA + _src("longest", "progression", "plotting"), ("as_of=" + AS_OF,)),
+    Stage("keely_all", keely_all, (FIG + "keely_all.png",),
+          KEELY_DATA + _src("keely", "meetings", "query", "plotting")),
+    Stage("keely_summary", keely_summary, (TAB + "keely_summary.html",),
+          KEELY_DATA + _src("keely", "meetings", "query")),
+    Stage("keely_trends", keely_trends, (TAB + "keely_trends.html",),
+          KEELY_DATA + _src("keely", "meetings", "query", "trends")),
+    Stage("keely_bests", keely_bests, (TAB + "keely_bests.html",),
+          KEELY_DATA + _src("keely", "meetings", "query", "toplists")),
+    Stage("keely_DL", keely_DL, (FIG + "keely_DL.png",),
+          KEELY_DATA + _src("keely", "meetings", "query", "plotting")),
+]}
+
+
+def build(name, profile=False):
+    """Run one stage (also in pool workers).
+
+    Returns the seconds it took and, with profile set, the spans a Profiler
+    recorded in this process while it ran (for a worker to hand back).
+    """
+    profiler = Profiler().start() if profile else None
+    try:
+        start = time.perf_counter()
+        with span(name, "stage"):
+            STAGES[name].run()
+        seconds = time.perf_counter() - start
+    finally:
+        if profiler is not None:
+            profiler.stop()
+    return seconds, profiler.events if profiler is not None else []
+
+
+def run(names=None, cache=None, force=False, jobs=1, profiler=None):
+    """Run the named stages (all of them by default) in pipeline order.
+
+    With a BuildCache, stages whose inputs are unchanged are skipped unless
+    force is set (forced builds still refresh the cache). With jobs > 1 the
+    stale stages after the scrape are built that many at a time in separate
+    processes. With a Profiler, each stage and its steps are recorded in it,
+    whichever process they ran in. Returns a list, in pipeline order, of (stage, "hit" or "miss",
+    seconds) where seconds is the time the stage took, or for a hit the time
+    it took when it was last built.
+    """
+    names = list(STAGES) if not names else names
+    unknown = [name for name in names if name not in STAGES]
+    if unknown:
+        raise KeyError(f"Unknown stage(s): {', '.join(unknown)}")
+
+    report = {}
+
+    def built(stage, result):
+        seconds, events = result
+        if profiler is not None:
+            profiler.extend(events)
+        if cache is not None:
+            cache.forget(stage.outputs)
+            cache.record(stage, seconds)
+        report[stage.name] = (stage.name, "miss", seconds)
+
+    try:
+        stale = []
+        for name in STAGES:
+            if name not in names:
+                continue
+            stage = STAGES[name]
+            if cache is not None and not force and cache.is_fresh(stage):
+                report[name] = (name, "hit", cache.seconds(stage))
+                continue
+            stale.append(stage)
+
+        # The scrape (inputs=None) writes what the rest read, so it goes first
+        parallel = [stage for stage in stale if stage.inputs is not None] if jobs > 1 else []
+        if len(parallel) < 2:
+            parallel = []
+        for stage in stale:
+            if stage not in parallel:
+                built(stage, build(stage.name))
+        if parallel:
+            with ProcessPoolExecutor(max_workers=min(jobs, len(parallel))) as pool:
+                futures = {pool.submit(build, stage.name, profiler is not None): stage for stage in parallel}
+                for future in as_completed(futures):
+                    built(futures[future], future.result())
+    finally:
+        if cache is not None:
+            cache.save()
+    return [report[name] for name in STAGES if name in report]
+
+
+def format_report(report):
+    lines = [f"{name:<16} {status:<5} {seconds:6.2f}s" for name, status, seconds in report]
+    hits = [seconds for _, status, seconds in report if status == "hit"]
+    misses = [seconds for _, status, seconds in report if status == "miss"]
+    lines.append(f"{len(hits)} hit(s), {len(misses)} miss(es): "
+                 f"built in {sum(misses):.2f}s, about {sum(hits):.2f}s saved")
+    return "\n".join(lines)
@@ -0,0 +1,195 @@
+""" stats.py                                              yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Grouped summary statistics: count, mean, min, quartiles, max and box-plot
+    whiskers/fliers for every gender x group, plus each gender overall.
+
+  grouped_stats() works in one pass: every row is entered once under its
+    group and once under its gender's Overall, the lot is sorted once by
+    (cell, value), and each statistic is then read off the sorted values by
+    position. The result is a tidy frame on a (Gender, Group) index that
+    both Table 1 and Figure 4 are drawn from.
+
+  For inputs too big to hold, QuantileSketch keeps a fixed-resolution
+    histogram per cell instead of the values: chunks are added as they are
+    read, sketches built separately (say one per file) merge by addition,
+    and quantiles come out to within the bin width.
+"""
+
+import numpy as np
+import pandas as pd
+
+OVERALL = "Overall"
+COLUMNS = ["Count", "Mean", "Min", "Q1", "Median", "Q3", "Max", "Whislo", "Whishi", "Fliers"]
+WHIS = 1.5  # whiskers reach the furthest value within 1.5 IQR of the box
+
+
+def _lerp(a, b, t):
+    # np.percentile's linear interpolation, so quartiles match matplotlib's
+    diff = b - a
+    return np.where(t >= 0.5, b - diff * (1 - t), a + diff * t)
+
+
+def _cells(frames, value, by):
+    # (gender, group) labels, cell codes and values, each row in two cells
+    labels, codes, values = [], [], []
+    for gender, df in frames.items():
+        df = df[df[value].notna()]
+        groups, group_names = pd.factorize(df[by], sort=True)
+        if df.empty:
+            continue
+        base = len(labels)
+        labels += [(gender, str(name)) for name in group_names] + [(gender, OVERALL)]
+        codes += [groups + base, np.full(len(df), len(labels) - 1)]
+        values += [df[value].to_numpy(dtype=float)] * 2
+    codes = np.concatenate(codes) if codes else np.array([], dtype=np.int64)
+    values = np.concatenate(values) if values else np.array([])
+    return labels, codes, values
+
+
+def _frame(labels, columns):
+    index = pd.MultiIndex.from_tuples(labels, names=["Gender", "Group"])
+    return pd.DataFrame(columns, index=index)[COLUMNS]
+
+
+def grouped_stats(frames, value="Age", by="Group"):
+    """Exact statistics of value per (gender, group) and (gender, "Overall").
+
+    frames maps a gender label to its DataFrame; missing values are skipped.
+    """
+    labels, codes, values = _cells(frames, value, by)
+    if not labels:
+        # Nothing to summarise: no cells, but the usual columns and index
+        dtypes = dict.fromkeys(COLUMNS, float) | {"Count": np.int64, "Fliers": object}
+        return _frame(labels, {col: pd.Series([], dtype=dtype) for col, dtype in dtypes.items()})
+    order = np.lexsort((values, codes))
+    codes, values = codes[order], values[order]
+
+    count = np.bincount(codes, minlength=len(labels))
+    start = np.concatenate([[0], np.cumsum(count)[:-1]])
+    end = start + count - 1
+
+    def quantile(q):
+        pos = start + (count - 1) * q
+        lo = np.floor(pos).astype(np.int64)
+        return _lerp(values[lo], values[np.minimum(lo + 1, end)], pos - lo)
+
+    q1, median, q3 = quantile(0.25), quantile(0.5), quantile(0.75)
+    iqr = q3 - q1
+
+    # Whiskers: values are sorted within each cell, so the first/last value
+    # inside the fences sits just past the count of values beyond them
+    low_fence, high_fence = q1 - WHIS * iqr, q3 + WHIS * iqr
+    below = values < low_fence[codes]
+    above = values > high_fence[codes]
+    whislo_at = start + np.bincount(codes, weights=below, minlength=len(labels)).astype(np.int64)
+    whishi_at = end - np.bincount(codes, weights=above, minlength=len(labels)).astype(np.int64)
+    outside = below | above
+
+    return _frame(labels, {
+        "Count": count,
+        "Mean": np.add.reduceat(values, start) / count,
+        "Min": values[start],
+        "Q1": q1,
+        "Median": median,
+        "Q3": q3,
+        "Max": values[end],
+        "Whislo": values[whislo_at],
+        "Whishi": values[whishi_at],
+        "Fliers": [values[s:e + 1][outside[s:e + 1]] for s, e in zip(start, end)],
+    })
+
+
+class QuantileSketch:
+    """Mergeable per-cell histograms for statistics of data too big to hold.
+
+    Values are binned at a fixed resolution between lo and hi (values outside
+    are clamped into the end bins); count, sum, min and max are kept exactly.
+    """
+
+    def __init__(self, lo=0.0, hi=100.0, resolution=0.01):
+        self.lo = lo
+        self.resolution = resolution
+        self.bins = int(np.ceil((hi - lo) / resolution))
+        self.labels = []
+        self.counts = np.zeros((0, self.bins), dtype=np.int64)
+        self.sums = np.zeros(0)
+        self.mins = np.zeros(0)
+        self.maxs = np.zeros(0)
+
+    def _rows(self, labels):
+        known = {label: i for i, label in enumerate(self.labels)}
+        new = [label for label in labels if label not in known]
+        if new:
+            self.labels += new
+            self.counts = np.vstack([self.counts, np.zeros((len(new), self.bins), dtype=np.int64)])
+            self.sums = np.concatenate([self.sums, np.zeros(len(new))])
+            self.mins = np.concatenate([self.mins, np.full(len(new), np.inf)])
+            self.maxs = np.concatenate([self.maxs, np.full(len(new), -np.inf)])
+            known = {label: i for i, label in enumerate(self.labels)}
+        return np.array([known[label] for label in labels], dtype=np.int64)
+
+    def add(self, frames, value="Age", by="Group"):
+        """Add a chunk: frames maps a gender label to a DataFrame (chunk)."""
+        labels, codes, values = _cells(frames, value, by)
+        rows = self._rows(labels)[codes]
+        bins = np.clip(((values - self.lo) / self.resolution).astype(np.int64), 0, self.bins - 1)
+        self.counts += np.bincount(rows * self.bins + bins, minlength=self.counts.size).reshape(self.counts.shape)
+        self.sums += np.bincount(rows, weights=values, minlength=len(self.labels))
+        np.minimum.at(self.mins, rows, values)
+        np.maximum.at(self.maxs, rows, values)
+        return self
+
+    def merge(self, other):
+        """Fold another sketch (same lo/resolution) into this one."""
+        if (other.lo, other.resolution, other.bins) != (self.lo, self.resolution, self.bins):
+            raise ValueError("Sketches with different bins can't be merged")
+        rows = self._rows(other.labels)
+        self.counts[rows] += other.counts
+        self.sums[rows] += other.sums
+        self.mins[rows] = np.minimum(self.mins[rows], other.mins)
+        self.maxs[rows] = np.maximum(self.maxs[rows], other.maxs)
+        return self
+
+    def stats(self):
+        """Same layout as grouped_stats(), quartiles/whiskers/fliers to within a bin."""
+        count = self.counts.sum(axis=1)
+        cumulative = self.counts.cumsum(axis=1)
+        centres = self.lo + (np.arange(self.bins) + 0.5) * self.resolution
+
+        def ranked(k):
+            # Value of the k-th smallest entry of each cell: the centre of its bin
+            at = np.array([np.searchsorted(c, r, side="right") for c, r in zip(cumulative, k)], dtype=np.int64)
+            return np.clip(centres[np.minimum(at, self.bins - 1)], self.mins, self.maxs)
+
+        def quantile(q):
+            # Interpolated between ranks as np.percentile does
+            pos = np.maximum(count - 1, 0) * q
+            lo = np.floor(pos)
+            return _lerp(ranked(lo), ranked(np.minimum(lo + 1, np.maximum(count - 1, 0))), pos - lo)
+
+        q1, median, q3 = quantile(0.25), quantile(0.5), quantile(0.75)
+        iqr = q3 - q1
+        low_fence, high_fence = q1 - WHIS * iqr, q3 + WHIS * iqr
+        whislo, whishi, fliers = [], [], []
+        for row in range(len(self.labels)):
+            filled = self.counts[row] > 0
+            inside = filled & (centres >= low_fence[row]) & (centres <= high_fence[row])
+            whislo.append(max(centres[inside].min(), self.mins[row]) if inside.any() else q1[row])
+            whishi.append(min(centres[inside].max(), self.maxs[row]) if inside.any() else q3[row])
+            out = filled & ~inside
+            fliers.append(np.repeat(centres[out], self.counts[row][out]))
+
+        return _frame(self.labels, {
+            "Count": count, "Mean": self.sums / np.maximum(count, 1),
+            "Min": self.mins, "Q1": q1, "Median": median, "Q3": q3, "Max": self.maxs,
+            "Whislo": whislo, "Whishi": whishi, "Fliers": fliers,
+        })
+
+
+def sketch_stats(chunks, value="Age", by="Group", **sketch_options):
+    """grouped_stats() over an iterable of {gender: DataFrame chunk} dicts, via a QuantileSketch."""
+    sketch = QuantileSketch(**sketch_options)
+    for frames in chunks:
+        sketch.add(frames, value, by)
+    return sketch.stats()
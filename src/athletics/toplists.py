@@ -0,0 +1,282 @@
+""" toplists.py                                           yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Season top lists and personal bests over performance logs in the
+    keely_data.csv layout, kept up to date as new results are appended.
+
+  SeasonLists holds each athlete's personal best per event and, for every
+    event and season, a heap of the n best marks (one per athlete by
+    default, as in a world top list, or every mark). update() takes a chunk
+    of new results, say one day's, and costs time in proportion to that
+    chunk, not to the history: the chunk is reduced to each athlete's best
+    per list and each list's n best with a sort of the chunk alone, those
+    are checked against the list's current n-th mark, and only the few
+    left are pushed onto the heaps.
+
+  "Better" follows the unit, as in the gender gap: lower for timed events
+    (seconds), higher for measured ones (metres, points). Marks are signed
+    so that lower is always better, as in progression.py; a mark only
+    displaces another if it is strictly better, so on a tie the earlier
+    one keeps its place.
+
+  Results are assumed to arrive in date order, chunk after chunk (within a
+    chunk they are sorted by date first).
+
+      python3 -m athletics.toplists LOG.csv [--n 50] [--events 800] [--season 2024]
+"""
+
+import argparse
+import heapq
+import sys
+
+import numpy as np
+import pandas as pd
+
+from .performance import normalize_performance
+
+TOP_N = 50
+DETAILS = ["Perf", "Venue", "Meeting", "Date"]
+
+
+def signed_marks(values, units):
+    """Marks signed so that lower is better: times as they are, distances and
+    points negated. NaN where there is no mark or unit."""
+    units = np.asarray(units, dtype=object)
+    sign = np.where(units == "s", 1.0, np.where(pd.isna(units), np.nan, -1.0))
+    return np.asarray(values, dtype=float) * sign
+
+
+def _first_per_group(codes, signed, seq):
+    # Position of the best (then earliest) row of each group
+    order = np.lexsort((seq, signed, codes))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = codes[order][1:] != codes[order][:-1]
+    return order[first]
+
+
+def _factorize_pairs(first, second):
+    # Codes for the distinct (first, second) pairs, and the pairs themselves
+    a, a_values = pd.factorize(first)
+    b, b_values = pd.factorize(second)
+    pairs, codes = np.unique(a.astype(np.int64) * len(b_values) + b, return_inverse=True)
+    return codes, list(zip(a_values[pairs // len(b_values)].tolist(), b_values[pairs % len(b_values)].tolist()))
+
+
+class TopList:
+    """The n best entries of one list, at most one per key.
+
+    Entries sit on a heap with the worst on top, so a newcomer is checked
+    against the n-th mark in O(1) and pushed in O(log n). When a listed key
+    improves, its new entry is pushed and the old one left on the heap, to
+    be dropped when it surfaces (the heap is rebuilt if these pile up).
+    """
+
+    def __init__(self, n=TOP_N):
+        self.n = n
+        self.heap = []  # (-signed, -seq, key): worst, then latest, on top
+        self.best = {}  # key -> (signed, seq, details)
+
+    def __len__(self):
+        return len(self.best)
+
+    def _current(self, item):
+        entry = self.best.get(item[2])
+        return entry is not None and entry[1] == -item[1]
+
+    def _clean(self):
+        while self.heap and not self._current(self.heap[0]):
+            heapq.heappop(self.heap)
+
+    def threshold(self):
+        """The signed mark a newcomer must beat (inf until the list is full)."""
+        if len(self.best) < self.n:
+            return np.inf
+        self._clean()
+        return -self.heap[0][0]
+
+    def offer(self, key, signed, seq, details):
+        """Enter a mark; True if it made (or improved) the list."""
+        listed = self.best.get(key)
+        if listed is not None:
+            if signed >= listed[0]:
+                return False
+        elif len(self.best) >= self.n:
+            if signed >= self.threshold():
+                return False
+            _, _, worst = heapq.heappop(self.heap)
+            del self.best[worst]
+        self.best[key] = (signed, seq, details)
+        heapq.heappush(self.heap, (-signed, -seq, key))
+        if len(self.heap) > 2 * self.n + 16:
+            self.heap = [(-signed, -seq, key) for key, (signed, seq, _) in self.best.items()]
+            heapq.heapify(self.heap)
+        return True
+
+    def entries(self):
+        """(key, signed, seq, details), best first."""
+        return sorted(((key, *entry) for key, entry in self.best.items()), key=lambda e: (e[1], e[2]))
+
+
+class SeasonLists:
+    """Personal bests and per-event, per-season top lists of a performance log.
+
+    athlete names the athlete column (None for a one-athlete log such as
+    keely_data.csv). by_athlete=True lists each athlete once per list, with
+    their season best; False lists every mark. details are the columns kept
+    with each listed mark besides the athlete. Marks are read from value
+    and units from unit, either parsed from Perf if not given.
+    """
+
+    def __init__(self, n=TOP_N, athlete="Athlete", event="Event", by_athlete=True,
+                 value="Perf_seconds", unit=None, details=DETAILS):
+        self.n = n
+        self.athlete, self.event, self.by_athlete = athlete, event, by_athlete
+        self.value, self.unit, self.details = value, unit, list(details)
+        self.lists = {}  # (event, season) -> TopList
+        self.pbs = {}    # (athlete, event) -> (signed, seq, details)
+        self.seq = 0     # results seen so far, for ties
+
+    @classmethod
+    def from_chunks(cls, chunks, **options):
+        lists = cls(**options)
+        for chunk in chunks:
+            lists.update(chunk)
+        return lists
+
+    def _marks(self, chunk):
+        if self.unit is None or self.value not in chunk:
+            parsed = normalize_performance(chunk["Perf"])
+            values = chunk[self.value] if self.value in chunk else parsed["value"]
+            units = parsed["unit"] if self.unit is None else chunk[self.unit]
+        else:
+            values, units = chunk[self.value], chunk[self.unit]
+        return signed_marks(values, units.astype(object))
+
+    def _athletes(self, chunk):
+        if self.athlete is None:
+            return np.full(len(chunk), "", dtype=object)
+        return chunk[self.athlete].astype(str).to_numpy(dtype=object)
+
+    def update(self, chunk):
+        """Add a chunk of new results; returns a boolean Series (on chunk's
+        index) marking the results that were personal bests when set."""
+        order = np.argsort(chunk["Date"].to_numpy(), kind="stable")
+        chunk = chunk.iloc[order]
+        signed = self._marks(chunk)
+        seq = self.seq + np.arange(len(chunk))
+        self.seq += len(chunk)
+        known = ~np.isnan(signed) & chunk["Date"].notna().to_numpy()
+        athletes = self._athletes(chunk)
+        events = chunk[self.event].astype(str).to_numpy(dtype=object)
+        seasons = chunk["Date"].dt.year.to_numpy()
+        details = pd.DataFrame({"Athlete": athletes, **{col: chunk[col].to_numpy() if col in chunk else None
+                                                        for col in self.details}})
+
+        pb = np.zeros(len(chunk), dtype=bool)
+        if known.any():
+            pb[known] = self._update_pbs(athletes[known], events[known], signed[known], seq[known],
+                                         details[known])
+            self._update_lists(athletes[known], events[known], seasons[known], signed[known], seq[known],
+                               details[known])
+        flags = np.empty(len(chunk), dtype=bool)
+        flags[order] = pb
+        return pd.Series(flags, index=chunk.index[np.argsort(order)])
+
+    def _update_pbs(self, athletes, events, signed, seq, details):
+        codes, keys = _factorize_pairs(athletes, events)
+        prior = np.array([self.pbs.get(key, (np.inf,))[0] for key in keys])
+
+        # Best before each row: the stored PB or an earlier row of this chunk
+        running = pd.Series(signed).groupby(codes).cummin()
+        before = np.minimum(prior[codes], running.groupby(codes).shift(fill_value=np.inf).to_numpy())
+        pb = signed < before
+
+        # Each athlete/event's best of the chunk, where it beats the stored PB
+        best = _first_per_group(codes, signed, seq)
+        best = best[signed[best] < prior[codes[best]]]
+        for i, row in zip(best, details.iloc[best].itertuples(index=False, name=None)):
+            self.pbs[keys[codes[i]]] = (signed[i], seq[i], row)
+        return pb
+
+    def _update_lists(self, athletes, events, seasons, signed, seq, details):
+        lists, keys = _factorize_pairs(events, seasons)
+        rows = np.arange(len(signed))
+        if self.by_athlete:
+            # Only each athlete's best of the chunk can matter to a list
+            who = pd.factorize(athletes)[0].astype(np.int64)
+            rows = _first_per_group(lists.astype(np.int64) * (who.max() + 1) + who, signed, seq)
+
+        # Then only each list's n best of those, and only if they beat its n-th mark
+        order = rows[np.lexsort((seq[rows], signed[rows], lists[rows]))]
+        rank = pd.Series(lists[order]).groupby(lists[order]).cumcount().to_numpy()
+        order = order[rank < self.n]
+        toplists = [self.lists.setdefault(key, TopList(self.n)) for key in keys]
+        threshold = np.array([toplist.threshold() for toplist in toplists])
+        order = order[signed[order] < threshold[lists[order]]]
+
+        values = details.iloc[order].itertuples(index=False, name=None)
+        for i, row in zip(order, values):
+            key = athletes[i] if self.by_athlete else seq[i]
+            toplists[lists[i]].offer(key, signed[i], seq[i], row)
+
+    def _frame(self, rows, columns):
+        # rows hold the signed mark after columns; it goes back to a plain Mark
+        df = pd.DataFrame(rows, columns=columns + ["Mark", "Athlete"] + self.details)
+        df["Mark"] = df["Mark"].abs()
+        return df if self.athlete is not None else df.drop(columns="Athlete")
+
+    def top(self, event, season):
+        """The top list for one event and season, best first."""
+        toplist = self.lists.get((str(event), season))
+        entries = toplist.entries() if toplist is not None else []
+        return self._frame([(rank, signed, *details) for rank, (_, signed, _, details) in enumerate(entries, 1)],
+                           ["Rank"])
+
+    def toplists(self):
+        """Every list, by event then season."""
+        frames = [self.top(event, season).assign(Event=event, Season=season)
+                  for event, season in sorted(self.lists)]
+        if not frames:
+            return self.top(None, None).assign(Event=None, Season=None)
+        return pd.concat(frames, ignore_index=True)
+
+    def personal_bests(self):
+        """Each athlete's best mark in each event."""
+        rows = [(event, signed, *details) for (_, event), (signed, _, details) in sorted(self.pbs.items())]
+        return self._frame(rows, ["Event"])
+
+
+def main(argv=None):
+    from .ingest import read_log
+
+    parser = argparse.ArgumentParser(prog="athletics.toplists",
+                                     description="Season top lists and personal bests of a performance log.")
+    parser.add_argument("log", help="CSV in the keely_data.csv layout (with an Athlete column)")
+    parser.add_argument("--n", type=int, default=TOP_N, help="length of each list")
+    parser.add_argument("--events", nargs="*", help="events to keep (default: all)")
+    parser.add_argument("--season", type=int, help="only print this season's lists")
+    parser.add_argument("--all-marks", action="store_true", help="list every mark, not one per athlete")
+    parser.add_argument("--pbs", action="store_true", help="print personal bests instead")
+    args = parser.parse_args(argv)
+
+    chunks = read_log(args.log, events=args.events)
+    first = next(chunks, None)
+    athlete = "Athlete" if first is not None and "Athlete" in first else None
+    lists = SeasonLists(args.n, athlete=athlete, by_athlete=not args.all_marks)
+    if first is not None:
+        lists.update(first)
+        for chunk in chunks:
+            lists.update(chunk)
+
+    if args.pbs:
+        print(lists.personal_bests().to_string(index=False))
+        return 0
+    for event, season in sorted(lists.lists):
+        if args.season is None or season == args.season:
+            print(f"\n{event} {season}")
+            print(lists.top(event, season).to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+""" trends.py                                             yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Batched performance trends: a straight line through each athlete's (or any
+    other group's) marks against date, and when that line reaches a record.
+
+  fit_trends() fits every group at once. The sums OLS needs (n, mean date,
+    mean mark, centred cross products, residuals) are bincounts over one
+    array of group codes, so a million rows across tens of thousands of
+    athletes take a handful of vectorised passes rather than a statsmodels
+    model each. Dates are matplotlib date numbers (days since 1970), so the
+    coefficients are the same as fit_trend()'s in keely.py.
+
+  The predicted crossing is (record - intercept) / slope, with a confidence
+    interval from the delta method on the fitted coefficients. It is only
+    meaningful where the slope heads towards the record and is clearly
+    non-zero; the interval widens without bound as the slope's does.
+
+  For a few selected groups, fit_models() hands back the full statsmodels
+    results (summary(), diagnostics) as keely_summary.html uses.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .paths import TAB
+
+EPOCH = pd.Timestamp("1970-01-01")
+DAY = pd.Timedelta(days=1)
+COLUMNS = ["N", "Intercept", "Slope", "Intercept_SE", "Slope_SE", "Residual_SE",
+           "Record", "Crossing", "Crossing_Low", "Crossing_High"]
+LIMIT = (pd.Timestamp.max - EPOCH) // DAY  # days past which no date can be made
+
+
+def date_numbers(dates):
+    """Days since 1970 as floats, as matplotlib.dates.date2num gives."""
+    return ((pd.Series(dates) - EPOCH) / DAY).to_numpy(dtype=float)
+
+
+def _days_to_dates(days):
+    days = np.asarray(days, dtype=float)
+    valid = np.isfinite(days) & (np.abs(days) < LIMIT)
+    return pd.to_datetime(np.where(valid, days, 0) * 86400e9, unit="ns").where(valid)
+
+
+def _records(record, keys):
+    # Record per group: one number for all, or a Series on one of the key columns
+    if not isinstance(record, pd.Series):
+        return np.full(len(keys), np.nan if record is None else float(record))
+    return keys[record.index.name].map(record).to_numpy(dtype=float)
+
+
+def fit_trends(df, by=("Athlete", "Event"), x="Date", y="Perf_seconds", record=None, level=0.95):
+    """OLS of y on date for every group of by, one row per group.
+
+    record is the mark whose crossing is predicted: a number, or a Series
+    indexed by one of the by columns (e.g. world records by Event).
+    Crossing dates come with a level confidence interval; groups of fewer
+    than three marks get no standard errors or interval.
+    """
+    from scipy.stats import t as student_t
+
+    by = [by] if isinstance(by, str) else list(by)
+    df = df.dropna(subset=[x, y])
+    groups = df.groupby(by, observed=True, sort=True)
+    codes = groups.ngroup().to_numpy()
+    keys = groups.size().index.to_frame(index=False)
+    size = len(keys)
+
+    xs = date_numbers(df[x]) if np.issubdtype(df[x].dtype, np.datetime64) else df[x].to_numpy(dtype=float)
+    ys = df[y].to_numpy(dtype=float)
+
+    def total(weights):
+        return np.bincount(codes, weights=weights, minlength=size)
+
+    # Centred sums keep the precision that raw date numbers squared would lose
+    n = total(None)
+    mean_x, mean_y = total(xs) / n, total(ys) / n
+    dx, dy = xs - mean_x[codes], ys - mean_y[codes]
+    sxx, sxy = total(dx * dx), total(dx * dy)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = sxy / sxx
+        intercept = mean_y - slope * mean_x
+        residual = dy - slope[codes] * dx
+        dof = n - 2
+        s2 = np.where(dof > 0, total(residual * residual) / dof, np.nan)
+        var_slope = s2 / sxx
+        var_intercept = s2 * (1 / n + mean_x ** 2 / sxx)
+        cov = -mean_x * var_slope
+
+        # Crossing by the delta method: d/da = -1/b, d/db = -(r - a)/b**2
+        records = _records(record, keys)
+        crossing = (records - intercept) / slope
+        se = np.sqrt(var_intercept + 2 * crossing * cov + crossing ** 2 * var_slope) / np.abs(slope)
+        half = student_t.ppf(0.5 + level / 2, np.where(dof > 0, dof, np.nan)) * se
+
+    out = keys.assign(**{
+        "N": n.astype(np.int64),
+        "Intercept": intercept,
+        "Slope": slope,
+        "Intercept_SE": np.sqrt(var_intercept),
+        "Slope_SE": np.sqrt(var_slope),
+        "Residual_SE": np.sqrt(s2),
+        "Record": records,
+        "Crossing": _days_to_dates(crossing),
+        "Crossing_Low": _days_to_dates(crossing - half),
+        "Crossing_High": _days_to_dates(crossing + half),
+    })
+    return out.set_index(by)[COLUMNS]
+
+
+def fit_models(df, select, by=("Athlete", "Event"), x="Date", y="Perf_seconds"):
+    """Full statsmodels OLS results for the selected groups, keyed as selected.
+
+    select lists group keys (tuples when by has more than one column).
+    """
+    import statsmodels.api as sm
+
+    by = [by] if isinstance(by, str) else list(by)
+    groups = df.dropna(subset=[x, y]).groupby(by if len(by) > 1 else by[0], observed=True)
+    models = {}
+    for key in select:
+        group = groups.get_group(key)
+        X = sm.add_constant(date_numbers(group[x]))
+        models[key] = sm.OLS(group[y], X).fit()
+    return models
+
+
+def write_trends(trends, path=TAB + "keely_trends.html"):
+    """Table of slopes (seconds a year) and predicted crossing dates."""
+    table = pd.DataFrame({
+        "Marks": trends["N"],
+        "Slope (s/year)": (trends["Slope"] * 365.25).round(3),
+        "SE (s/year)": (trends["Slope_SE"] * 365.25).round(3),
+        "Predicted WR": trends["Crossing"].dt.date,
+        "95% CI from": trends["Crossing_Low"].dt.date,
+        "95% CI to": trends["Crossing_High"].dt.date,
+    })
+    with open(path, "w") as f:
+        f.write(table.reset_index().to_html(index=False, border=1))
@@ -0,0 +1,155 @@
+""" watch.py                                              yyyy-mm-dd:2025-04-09
+---|----1----|----2----|----3----|----4----|----5----|----6----|----7----|----8
+
+  Watch mode: one long-running process that rebuilds outputs as data/ and
+    index.md are edited.
+
+  On start the section modules (pandas, matplotlib, seaborn, statsmodels)
+    are imported, the prepared frames loaded and every stale stage built.
+    data/ and index.md are then polled. When a file changes, only the
+    in-process caches built from it are dropped (the record frames, the
+    record progressions or the Keely frame and their query indexes, the
+    country/athlete/event indexes or the calendar), the build cache forgets
+    the file's digest, and run() rebuilds the stages whose inputs hash
+    differently; every other stage is a cache hit. An edited index.md is turned into index.html with pandoc,
+    if it is installed.
+
+  The scrape stage is left out unless named: it fetches the page on every
+    run, and the files it writes are the ones being watched.
+
+  Edits to the package's own code are not picked up; restart for those.
+
+      python3 -m athletics --watch [STAGE ...]
+"""
+
+import importlib
+import os
+import shutil
+import subprocess
+import sys
+import time
+import traceback
+
+from .paths import DAT, KEELY_DATA, PROGRESSION_DATA, RECORDS_DATA, ROOT
+
+INDEX = ROOT + "/index.md"
+WARM = ("pandas", "matplotlib.backends.backend_agg", "seaborn", "statsmodels.api", "scipy.stats",
+        ".olympics", ".gender_gap", ".ages", ".longest", ".keely", ".trends")
+
+
+def watched():
+    """The files to poll: everything directly in data/ (not the caches) and index.md."""
+    files = [DAT + name for name in sorted(os.listdir(DAT))
+             if not name.startswith(".") and os.path.isfile(DAT + name)]
+    return files + [INDEX]
+
+
+def snapshot(paths):
+    state = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        state[path] = (st.st_mtime_ns, st.st_size)
+    return state
+
+
+def changes(before, after):
+    return sorted(path for path in before.keys() | after.keys() if before.get(path) != after.get(path))
+
+
+def warm():
+    """Import the heavy modules and load the prepared frames once, up front."""
+    for module in WARM:
+        importlib.import_module(module, __package__)
+    from .prepare import load_keely, load_progression, load_records
+    from .query import keely_index
+    load_records()
+    load_progression()
+    load_keely()
+    keely_index()
+
+
+def invalidate(paths):
+    """Drop the in-process caches built from any of paths."""
+    from . import athletes, championships, countries, events, prepare, query, scoring
+
+    paths = set(paths)
+    if paths & {countries.COUNTRIES, countries.ALIASES}:
+        countries.default_countries.cache_clear()
+    if paths & {athletes.DOBS, athletes.ALIASES}:
+        athletes.default_athletes.cache_clear()
+    if events.RULES in paths:
+        events.default_taxonomy.cache_clear()
+    if scoring.TABLES in paths:
+        scoring.default_scoring.cache_clear()
+    if championships.CALENDAR in paths:
+        championships.load_calendar.cache_clear()
+    if paths & set(RECORDS_DATA):
+        prepare.load_records.cache_clear()
+        prepare.load_progression.cache_clear()
+        query.records_index.cache_clear()
+    if paths & set(PROGRESSION_DATA):
+        prepare.load_progression.cache_clear()
+    if paths & set(KEELY_DATA):
+        prepare.load_keely.cache_clear()
+        query.keely_index.cache_clear()
+
+
+def render_index():
+    pandoc = shutil.which("pandoc")
+    if pandoc is None:
+        print("index.md changed (pandoc not found, index.html not rebuilt)")
+        return
+    subprocess.run([pandoc, INDEX, "-o", ROOT + "/index.html"], check=False)
+
+
+def rebuild(changed, names, cache):
+    """Rebuild what depends on the changed files; returns run()'s report."""
+    from .stages import run
+
+    invalidate(changed)
+    cache.forget(changed)
+    if INDEX in changed:
+        render_index()
+    return run(names, cache=cache)
+
+
+def watch(names=None, cache=None, interval=0.1, out=sys.stdout):
+    """Build the named stages (all but scrape by default), then rebuild on every
+    change until interrupted."""
+    from .cache import BuildCache
+    from .stages import STAGES, format_report, run
+
+    if not names:
+        names = [name for name, stage in STAGES.items() if stage.inputs is not None]
+    cache = BuildCache() if cache is None else cache
+    start = time.perf_counter()
+    warm()
+    print(format_report(run(names, cache=cache)), file=out)
+    print(f"Ready in {time.perf_counter() - start:.2f}s; watching {DAT} and {INDEX} (Ctrl-C to stop)", file=out)
+
+    seen = snapshot(watched())
+    try:
+        while True:
+            time.sleep(interval)
+            now = snapshot(watched())
+            if now == seen:
+                continue
+            # Let a burst of writes (an editor saving, a scrape) settle first
+            time.sleep(interval)
+            now = snapshot(watched())
+            changed, seen = changes(seen, now), now
+
+            start = time.perf_counter()
+            try:
+                report = rebuild(changed, names, cache)
+            except Exception:
+                traceback.print_exc()
+                continue
+            built = [name for name, status, _ in report if status == "miss"]
+            print(f"{', '.join(os.path.basename(path) for path in changed)} changed: "
+                  f"rebuilt {', '.join(built) or 'nothing'} in {time.perf_counter() - start:.2f}s", file=out)
+    except KeyboardInterrupt:
+        return 0
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from athletics.gender_gap import gap_history, record_gaps
+from athletics.progression import RecordStore
+
+
+def progression(rows):
+    return pd.DataFrame(rows, columns=["Event", "Date", "Performance_value", "Performance_unit"]).assign(
+        Date=lambda df: pd.to_datetime(df["Date"]))
+
+
+def test_gap_history_follows_both_records():
+    men = progression([("800 m", "1979-07-05", 102.33, "s"), ("800 m", "1981-06-10", 101.73, "s"),
+                       ("Pole vault", "1994-07-31", 6.14, "m")])
+    women = progression([("800 m", "1980-07-27", 113.43, "s"), ("800 m", "1983-07-26", 113.28, "s"),
+                         ("Pole vault", "2005-08-12", 5.01, "m"), ("Pole vault", "2009-08-28", 5.06, "m")])
+
+    history = gap_history(men, women)
+
+    # Nothing before both genders hold a record; then one row per change
+    assert list(history["Event"]) == ["800 m"] * 3 + ["Pole vault"] * 2
+    assert list(history["Date"].dt.strftime("%Y-%m-%d")) == ["1980-07-27", "1981-06-10", "1983-07-26",
+                                                             "2005-08-12", "2009-08-28"]
+    assert list(history["Men"]) == [102.33, 101.73, 101.73, 6.14, 6.14]
+    assert list(history["Women"]) == [113.43, 113.43, 113.28, 5.01, 5.06]
+    expected = [(113.43 - 102.33) / 102.33, (113.43 - 101.73) / 101.73, (113.28 - 101.73) / 101.73,
+                (6.14 - 5.01) / 5.01, (6.14 - 5.06) / 5.06]
+    np.testing.assert_allclose(history["Gender_Gap"], np.array(expected) * 100)
+
+
+def test_gap_history_ignores_slower_marks():
+    # A mark that is not a record (slower than the standing one) changes nothing
+    men = progression([("100 m", "1968-10-14", 9.95, "s"), ("100 m", "1970-01-01", 10.05, "s")])
+    women = progression([("100 m", "1968-10-15", 11.08, "s")])
+
+    history = gap_history(men, women)
+
+    assert list(history["Men"]) == [9.95, 9.95]
+
+
+def test_record_gaps_from_a_store():
+    records = pd.concat([progression([("800 m", "1979-07-05", 102.33, "s"), ("800 m", "2012-08-09", 100.91, "s")])
+                         .assign(Gender="Male"),
+                         progression([("800 m", "1983-07-26", 113.28, "s"), ("Mile", "2023-07-21", 247.64, "s")])
+                         .assign(Gender="Female")], ignore_index=True)
+
+    history = record_gaps(RecordStore(records), events=["800 m"])
+
+    assert list(history["Date"].dt.year) == [1983, 2012]
+    assert list(history["Men"]) == [102.33, 100.91]
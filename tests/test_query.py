@@ -0,0 +1,24 @@
+import pandas as pd
+import pytest
+
+from athletics.query import FrameIndex
+
+
+def records():
+    return pd.DataFrame({"Event": ["800 m", "800 m", "1500 m", "800 m"],
+                         "Date": pd.to_datetime(["1979-12-31 00:00", "1980-01-01 00:00", "1989-07-05 18:30", "1990-01-01 00:00"])})
+
+
+def test_bare_year_bounds_cover_the_whole_year():
+    index = FrameIndex(records(), keys=["Event"])
+
+    assert list(index.positions(date_from="1980", date_to="1989")) == [1, 2]
+    assert list(index.positions(date_from=1980, date_to=1989)) == [1, 2]
+    assert list(index.positions(date_to="1989-07")) == [0, 1, 2]
+    assert list(index.positions(date_to="1989-07-04")) == [0, 1]
+    assert list(index.rows(Event="800 m", date_from="1980", date_to="1989").index) == [1]
+
+
+def test_date_bounds_without_a_date_column():
+    with pytest.raises(ValueError):
+        FrameIndex(records(), keys=["Event"], dates=None).positions(date_to="1989")
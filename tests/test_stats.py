@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from athletics.stats import COLUMNS, grouped_stats
+
+
+def ages(values, groups):
+    return pd.DataFrame({"Age": values, "Group": groups})
+
+
+def test_grouped_stats_matches_numpy():
+    df = ages([20.0, 22.0, 30.0, 25.0, np.nan], ["Sprints", "Sprints", "Sprints", "Field", "Field"])
+
+    stats = grouped_stats({"Male": df})
+
+    assert list(stats.index) == [("Male", "Field"), ("Male", "Sprints"), ("Male", "Overall")]
+    sprints = stats.loc[("Male", "Sprints")]
+    assert sprints["Count"] == 3
+    assert sprints["Median"] == 22.0
+    assert sprints["Q1"] == np.percentile([20, 22, 30], 25)
+    assert stats.loc[("Male", "Overall"), "Mean"] == np.mean([20, 22, 30, 25])
+
+
+def test_grouped_stats_all_empty():
+    empty = ages(pd.Series([], dtype=float), pd.Series([], dtype=object))
+
+    for frames in ({"Male": empty, "Female": empty}, {"Male": ages([np.nan], ["Sprints"])}, {}):
+        stats = grouped_stats(frames)
+        assert stats.empty
+        assert list(stats.columns) == COLUMNS
+        assert list(stats.index.names) == ["Gender", "Group"]
+        assert stats["Count"].dtype == np.int64
+
+
+def test_grouped_stats_one_gender_empty():
+    stats = grouped_stats({"Male": ages([20.0], ["Sprints"]), "Female": ages([np.nan], ["Sprints"])})
+
+    assert list(stats.index) == [("Male", "Sprints"), ("Male", "Overall")]